@@ -22,6 +22,8 @@ def run_post_creator(topic: str, audience: str, tone: str, keywords: list[str],
         "keywords": keywords,
         "length": length,
         "research_notes": [],
+        "research_timings": {},
+        "research_errors": [],
         "draft_versions": [],
         "current_draft": None,
         "hashtags": [],
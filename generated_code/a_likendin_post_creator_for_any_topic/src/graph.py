@@ -1,8 +1,12 @@
-from langgraph.graph import StateGraph, END
+from typing import List
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
 from .models import PostCreatorState
 from .nodes import (
+    research_keyword,
     research_topic,
     create_initial_draft,
+    check_revision_needed,
     review_and_refine,
     add_hashtags,
     finalize_post
@@ -13,6 +17,15 @@ logger = logging.getLogger(__name__)
 
 # --- Conditional Edge Logic ---
 
+def fan_out_research(state: PostCreatorState) -> List[Send]:
+    """Map step: sends one research branch per keyword so they run in parallel."""
+    keywords = state.get('keywords') or [state['topic']]
+    logger.info(f"Fanning out research into {len(keywords)} parallel branch(es): {keywords}")
+    return [
+        Send("research_keyword", {"topic": state['topic'], "audience": state['audience'], "keyword": keyword})
+        for keyword in keywords
+    ]
+
 def should_refine(state: PostCreatorState) -> str:
     """Determines if the draft needs refinement based on the 'needs_revision' flag."""
     logger.info(f"Checking if refinement is needed. Needs revision: {state.get('needs_revision', False)}")
@@ -56,14 +69,17 @@ def create_linkedin_post_graph() -> StateGraph:
 
     # Add nodes
     logger.info("Adding nodes to the graph...")
+    workflow.add_node("research_keyword", research_keyword)
     workflow.add_node("research", research_topic)
     workflow.add_node("create_initial_draft", create_initial_draft)
+    workflow.add_node("check_revision_needed", check_revision_needed)
     workflow.add_node("review_and_refine", review_and_refine)
     workflow.add_node("add_hashtags", add_hashtags)
     workflow.add_node("finalize_post", finalize_post)
 
-    # Set entry point
-    workflow.set_entry_point("research")
+    # Entry point: fan out one research branch per keyword, then reduce in "research"
+    workflow.add_conditional_edges(START, fan_out_research, ["research_keyword"])
+    workflow.add_edge("research_keyword", "research")
 
     # Add edges with error checking
     logger.info("Adding edges to the graph...")
@@ -88,7 +104,7 @@ def create_linkedin_post_graph() -> StateGraph:
     # Conditional edge after drafting to decide if refinement is needed
     # This node acts as the decision point based on external input (simulated via 'needs_revision' flag)
     workflow.add_conditional_edges(
-        "check_revision_needed", # A conceptual node name for the decision point
+        "check_revision_needed", # Decision point node
         should_refine, # The function that checks the 'needs_revision' flag
         {
             "review_and_refine": "review_and_refine", # If needs_revision is True
@@ -102,7 +118,7 @@ def create_linkedin_post_graph() -> StateGraph:
         "review_and_refine",
         check_for_errors, # Check for errors after refinement attempt
         {
-            "adding_hashtags": "add_hashtags", # If refinement successful and no more revisions needed
+            "add_hashtags": "add_hashtags", # If refinement successful and no more revisions needed
             "__end__": END # If refinement failed
         }
     )
@@ -1,10 +1,23 @@
-from typing import TypedDict, List, Optional, Union
+import operator
+from typing import Annotated, TypedDict, Dict, List, Optional, Union
 from langchain_core.messages import AIMessage, HumanMessage
 from pydantic import BaseModel, Field
 import logging
 
 logger = logging.getLogger(__name__)
 
+def merge_timings(left: Dict[str, float], right: Dict[str, float]) -> Dict[str, float]:
+    """Reducer that merges the per-branch research timings."""
+    merged = dict(left or {})
+    merged.update(right or {})
+    return merged
+
+class ResearchTask(TypedDict):
+    """Payload sent to a single research branch by the map step."""
+    topic: str
+    audience: str
+    keyword: str
+
 class PostCreatorState(TypedDict):
     """Represents the state of the LinkedIn post creation workflow."""
 
@@ -16,7 +29,10 @@ class PostCreatorState(TypedDict):
     length: str  # e.g., "short", "medium", "long"
 
     # Working memory
-    research_notes: List[str] = Field(default_factory=list)
+    # Research runs as parallel branches (one per keyword); reducers merge their outputs
+    research_notes: Annotated[List[str], operator.add] = Field(default_factory=list)
+    research_timings: Annotated[Dict[str, float], merge_timings] = Field(default_factory=dict)
+    research_errors: Annotated[List[str], operator.add] = Field(default_factory=list)
     draft_versions: List[str] = Field(default_factory=list)
     current_draft: Optional[str] = None
     hashtags: List[str] = Field(default_factory=list)
@@ -2,30 +2,68 @@ import time
 import random
 import logging
 from typing import Dict, Any
-from .models import PostCreatorState
+from .models import PostCreatorState, ResearchTask
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 # --- Node Functions ---
 
-def research_topic(state: PostCreatorState) -> Dict[str, Any]:
-    """Simulates researching the topic based on input."""
-    logger.info(f"Researching topic: {state['topic']} for audience: {state['audience']}")
-    state['status'] = "researching"
+def research_keyword(task: ResearchTask) -> Dict[str, Any]:
+    """Simulates researching the topic for a single keyword.
+
+    Runs as one parallel branch of the research map step (see ``fan_out_research`` in graph.py),
+    so it only returns reducer-backed keys that can be merged with the other branches.
+    """
+    keyword = task['keyword']
+    logger.info(f"Researching '{keyword}' for topic: {task['topic']}")
+    started = time.perf_counter()
     try:
         # Simulate API call or complex logic
         time.sleep(1)
         if random.random() < 0.05: # Simulate occasional research failure
-            raise ValueError("Failed to gather sufficient research data.")
+            raise ValueError(f"Failed to gather sufficient research data for '{keyword}'.")
 
         research_notes = [
-            f"Key insight about {state['topic']} relevant to {state['audience']}.",
-            f"Statistic: 75% of {state['audience']} are interested in {state['keywords'][0] if state['keywords'] else 'this topic'}.",
-            f"Emerging trend: {state['topic']} is evolving rapidly."
+            f"Key insight about {task['topic']} and {keyword} relevant to {task['audience']}.",
+            f"Statistic: 75% of {task['audience']} are interested in {keyword}.",
         ]
+        return {
+            "research_notes": research_notes,
+            "research_timings": {keyword: time.perf_counter() - started},
+        }
+    except Exception as e:
+        logger.error(f"Error during research for '{keyword}': {e}")
+        return {
+            "research_errors": [f"{keyword}: {str(e)}"],
+            "research_timings": {keyword: time.perf_counter() - started},
+        }
+
+def research_topic(state: PostCreatorState) -> Dict[str, Any]:
+    """Merges the results of the parallel research branches."""
+    logger.info(f"Merging research on topic: {state['topic']} for audience: {state['audience']}")
+    state['status'] = "researching"
+    try:
+        timings = state.get('research_timings', {})
+        for keyword, seconds in sorted(timings.items(), key=lambda item: item[1], reverse=True):
+            logger.info(f"Research branch '{keyword}' took {seconds:.2f}s")
+        if timings:
+            logger.info(f"Research latency bounded by slowest branch: {max(timings.values()):.2f}s "
+                        f"(sequential would have been {sum(timings.values()):.2f}s)")
+
+        errors = state.get('research_errors', [])
+        if errors:
+            logger.warning(f"{len(errors)} research branch(es) failed: {errors}")
+        if not state.get('research_notes'):
+            raise ValueError("Failed to gather sufficient research data.")
+
         logger.info("Research complete.")
-        return {"research_notes": research_notes, "status": "drafting", "error_message": None}
+        # research_notes has an additive reducer, so only the new note is returned
+        return {
+            "research_notes": [f"Emerging trend: {state['topic']} is evolving rapidly."],
+            "status": "drafting",
+            "error_message": None
+        }
     except Exception as e:
         logger.error(f"Error during research: {e}")
         return {"status": "error", "error_message": f"Research failed: {str(e)}"}
@@ -59,6 +97,11 @@ def create_initial_draft(state: PostCreatorState) -> Dict[str, Any]:
         logger.error(f"Error during drafting: {e}")
         return {"status": "error", "error_message": f"Drafting failed: {str(e)}"}
 
+def check_revision_needed(state: PostCreatorState) -> Dict[str, Any]:
+    """Decision point after drafting; the routing itself happens in should_refine."""
+    logger.info(f"Draft awaiting review. Needs revision: {state.get('needs_revision', False)}")
+    return {"status": "awaiting_review"}
+
 def review_and_refine(state: PostCreatorState) -> Dict[str, Any]:
     """Simulates refining the post based on feedback (if any)."""
     logger.info("Reviewing and potentially refining draft...")
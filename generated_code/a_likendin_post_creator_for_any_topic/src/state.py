@@ -1,6 +1,8 @@
 # src/state.py
-from typing import TypedDict, List, Optional, Union
+import operator
+from typing import Annotated, TypedDict, Dict, List, Optional, Union
 from langchain_core.messages import AIMessage, HumanMessage
+from .models import merge_timings
 
 class PostCreatorState(TypedDict):
     """
@@ -14,7 +16,9 @@ class PostCreatorState(TypedDict):
     length: str  # "short", "medium", "long"
 
     # Working memory
-    research_notes: List[str]
+    research_notes: Annotated[List[str], operator.add]  # Merged from parallel research branches
+    research_timings: Annotated[Dict[str, float], merge_timings]  # Seconds spent per research branch, merged across branches
+    research_errors: Annotated[List[str], operator.add]  # Failures reported by research branches
     draft_versions: List[str]
     current_draft: str
 
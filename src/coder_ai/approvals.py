@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+"""Asynchronous human approval gates.
+
+With ``human_input: true`` the crew blocks on the terminal until the reviewer answers.
+Here approval requests are written to a local queue directory instead and decisions
+come back through the ``approve`` command or a small HTTP endpoint, so the pipeline
+can keep working speculatively while the reviewer reads.
+
+Examples:
+    approve list
+    approve show plan-20250101-120000-1a2b3c
+    approve accept plan-20250101-120000-1a2b3c
+    approve reject code-20250101-121500-4d5e6f --feedback "Use a checkpointer"
+    approve serve --port 8765
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+APPROVAL_DIR = os.environ.get("APPROVAL_DIR", ".approvals")
+DEFAULT_PORT = 8765
+
+
+class ApprovalRequest(BaseModel):
+    """Work waiting for a reviewer's decision."""
+
+    id: str
+    stage: str  # "plan" or "code"
+    agent_type: str
+    content: str  # What the reviewer is asked to approve
+    created_at: float
+
+
+class ApprovalDecision(BaseModel):
+    """A reviewer's answer to an approval request."""
+
+    id: str
+    approved: bool
+    feedback: str = ""
+    decided_at: float
+
+
+class ApprovalQueue:
+    """File-backed queue of approval requests and decisions.
+
+    Each request is ``<id>.json`` in the queue directory and its decision, once made,
+    ``<id>.decision.json``. Requests are written with an atomic replace and decisions
+    are created exclusively, so the pipeline, the CLI and the HTTP endpoint can share
+    the directory without locking and the first decision on a request always wins.
+    """
+
+    def __init__(self, directory: str = APPROVAL_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, request_id: str, suffix: str = "") -> str:
+        if os.path.basename(request_id) != request_id or not request_id:
+            raise KeyError(f"Invalid approval id '{request_id}'")
+        return os.path.join(self.directory, f"{request_id}{suffix}.json")
+
+    def _write(self, path: str, model: BaseModel) -> None:
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(model.model_dump_json(indent=2))
+        os.replace(temp_path, path)
+
+    def _create(self, path: str, model: BaseModel) -> None:
+        """Writes a file that must not exist yet; raises FileExistsError if it does."""
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(model.model_dump_json(indent=2))
+        try:
+            # Linking fails if the file exists, and readers never see it half-written
+            os.link(temp_path, path)
+        finally:
+            os.remove(temp_path)
+
+    def submit(self, stage: str, content: str, agent_type: str = "") -> ApprovalRequest:
+        """Queues a new approval request and returns it."""
+        request_id = f"{stage}-{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}"
+        request = ApprovalRequest(id=request_id, stage=stage, agent_type=agent_type,
+                                  content=content, created_at=time.time())
+        self._write(self._path(request_id), request)
+        return request
+
+    def get(self, request_id: str) -> ApprovalRequest:
+        try:
+            with open(self._path(request_id), "r", encoding="utf-8") as f:
+                return ApprovalRequest.model_validate_json(f.read())
+        except FileNotFoundError:
+            raise KeyError(f"Unknown approval id '{request_id}'")
+
+    def decision(self, request_id: str) -> Optional[ApprovalDecision]:
+        """Returns the decision on a request, or None while it is pending."""
+        try:
+            with open(self._path(request_id, ".decision"), "r", encoding="utf-8") as f:
+                return ApprovalDecision.model_validate_json(f.read())
+        except FileNotFoundError:
+            return None
+
+    def decide(self, request_id: str, approved: bool, feedback: str = "") -> ApprovalDecision:
+        """Records a decision. Raises KeyError for unknown and ValueError for decided requests."""
+        self.get(request_id)
+        decision = ApprovalDecision(id=request_id, approved=approved, feedback=feedback, decided_at=time.time())
+        try:
+            self._create(self._path(request_id, ".decision"), decision)
+        except FileExistsError:
+            raise ValueError(f"Approval '{request_id}' has already been decided")
+        return decision
+
+    def requests(self) -> List[ApprovalRequest]:
+        """All requests, oldest first."""
+        requests = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json") and not name.endswith(".decision.json"):
+                try:
+                    requests.append(self.get(name[:-len(".json")]))
+                except (KeyError, ValueError):
+                    continue
+        return sorted(requests, key=lambda request: request.created_at)
+
+    def pending(self) -> List[ApprovalRequest]:
+        """Requests still waiting for a decision, oldest first."""
+        return [request for request in self.requests() if self.decision(request.id) is None]
+
+    def wait(self, request_id: str, timeout: Optional[float] = None, poll_interval: float = 1.0) -> ApprovalDecision:
+        """Blocks until the request is decided.
+
+        Raises:
+            TimeoutError: If no decision arrives within ``timeout`` seconds
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            decision = self.decision(request_id)
+            if decision is not None:
+                return decision
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"No decision on approval '{request_id}' after {timeout} seconds")
+            time.sleep(poll_interval)
+
+
+class ApprovalHandler(BaseHTTPRequestHandler):
+    """JSON endpoint for reviewers.
+
+    ``GET /approvals`` lists pending requests, ``GET /approvals/<id>`` returns a request
+    with its decision and ``POST /approvals/<id>`` with ``{"approved": bool, "feedback": str}``
+    decides it.
+    """
+
+    queue: ApprovalQueue = None  # Set per server by serve_approvals()
+
+    def _send(self, status: int, payload) -> None:
+        body = json.dumps(payload, indent=2).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _request_id(self) -> Optional[str]:
+        parts = self.path.rstrip("/").split("/")
+        return parts[2] if len(parts) == 3 and parts[1] == "approvals" else None
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") == "/approvals":
+            self._send(200, [request.model_dump() for request in self.queue.pending()])
+            return
+        request_id = self._request_id()
+        try:
+            if request_id is None:
+                raise KeyError(f"Unknown path '{self.path}'")
+            request = self.queue.get(request_id)
+        except KeyError as e:
+            self._send(404, {"error": e.args[0]})
+            return
+        decision = self.queue.decision(request_id)
+        self._send(200, {"request": request.model_dump(), "decision": decision.model_dump() if decision else None})
+
+    def do_POST(self) -> None:
+        request_id = self._request_id()
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(body.get("approved"), bool):
+                raise ValueError("Body must contain a boolean 'approved'")
+        except (ValueError, AttributeError) as e:
+            self._send(400, {"error": str(e)})
+            return
+        try:
+            if request_id is None:
+                raise KeyError(f"Unknown path '{self.path}'")
+            decision = self.queue.decide(request_id, body["approved"], str(body.get("feedback", "")))
+        except KeyError as e:
+            self._send(404, {"error": e.args[0]})
+            return
+        except ValueError as e:
+            self._send(409, {"error": str(e)})
+            return
+        self._send(200, decision.model_dump())
+
+    def log_message(self, format, *args) -> None:
+        # Keep the crew's console output readable
+        pass
+
+
+def serve_approvals(queue: ApprovalQueue, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                    background: bool = True) -> ThreadingHTTPServer:
+    """Starts the approval endpoint, by default on a daemon thread.
+
+    Returns:
+        The running server; call ``shutdown()`` to stop it
+    """
+    handler = type("BoundApprovalHandler", (ApprovalHandler,), {"queue": queue})
+    server = ThreadingHTTPServer((host, port), handler)
+    if background:
+        threading.Thread(target=server.serve_forever, name="approval-endpoint", daemon=True).start()
+    else:
+        server.serve_forever()
+    return server
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Review pending approval requests of the LangGraph coder.")
+    parser.add_argument("--dir", default=APPROVAL_DIR, help="Approval queue directory.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List pending requests.")
+    show = commands.add_parser("show", help="Print a request.")
+    show.add_argument("id")
+    for name in ("accept", "reject"):
+        decide = commands.add_parser(name, help=f"{name.capitalize()} a request.")
+        decide.add_argument("id")
+        decide.add_argument("--feedback", default="", help="What should change (sent back to the agents).")
+    serve = commands.add_parser("serve", help="Serve the HTTP approval endpoint.")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    queue = ApprovalQueue(args.dir)
+    try:
+        if args.command == "list":
+            pending = queue.pending()
+            if not pending:
+                print("No pending approvals.")
+            for request in pending:
+                waiting = time.time() - request.created_at
+                print(f"{request.id}  [{request.stage}] {request.agent_type}  waiting {waiting:.0f}s")
+        elif args.command == "show":
+            request = queue.get(args.id)
+            decision = queue.decision(args.id)
+            print(f"{request.id} [{request.stage}] {request.agent_type}\n\n{request.content}")
+            if decision:
+                print(f"\nDecision: {'approved' if decision.approved else 'rejected'} {decision.feedback}".rstrip())
+        elif args.command == "serve":
+            print(f"Approval endpoint on http://{args.host}:{args.port}/approvals")
+            serve_approvals(queue, args.host, args.port, background=False)
+        else:
+            decision = queue.decide(args.id, args.command == "accept", args.feedback)
+            print(f"{decision.id}: {'approved' if decision.approved else 'rejected'}")
+    except (KeyError, ValueError) as e:
+        parser.exit(1, f"Error: {e.args[0]}\n")
+
+
+if __name__ == "__main__":
+    main()
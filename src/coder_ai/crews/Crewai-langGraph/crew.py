@@ -2,14 +2,26 @@
 from crewai import Agent, Task, Crew, Process
 from crewai.project import agent, task, crew, before_kickoff, CrewBase
 from crewai.llm import LLM
+from crewai.crews.crew_output import CrewOutput
 from coder_ai.tools.crawl4ai_tool import DocumentationCrawlerTool
+from coder_ai.tools.cached_search_tool import CachedSearchTool
+from coder_ai.tools.graph_validator_tool import GraphValidatorTool
+from coder_ai.tools.knowledge_store import KnowledgeStoreReadTool
+from coder_ai.tools.package_writer_tool import PackageWriterTool, read_package, write_package
+from coder_ai.scoring import REQUIRED_CHECKS, CandidateScore, score_candidates
+from coder_ai.scaffolds import ScaffoldIndex
+from coder_ai.approvals import ApprovalDecision, ApprovalQueue
+from coder_ai.memory_storage import BoundedLTMStorage, RetentionPolicy
 from crewai_tools import FileWriterTool, SerperDevTool, FileReadTool
 from crewai.memory import LongTermMemory
-from crewai.memory.storage import ltm_sqlite_storage
 
 # Import tools
 import os
+import shutil
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -46,6 +58,9 @@ llm3 = LLM(
     temperature=0.2
 )
 
+# Models used for best-of-N code generation; candidates cycle through them in order
+candidate_llms = [llm, llm2, llm1, llm3]
+
 
 @CrewBase
 class LangGraphCoderCrew:
@@ -69,7 +84,24 @@ class LangGraphCoderCrew:
         os.makedirs(self.code_output_dir, exist_ok=True)
         
         Path("memory").mkdir(exist_ok=True, parents=True)    
+        
+        # One long-term memory storage shared by all crews, compacted in the background
+        self.memory_storage = BoundedLTMStorage(
+            db_path="memory/audience_memory.db",
+            policy=RetentionPolicy(
+                max_age_days=float(os.environ.get("LTM_MAX_AGE_DAYS", "90")),
+                max_items=int(os.environ.get("LTM_MAX_ITEMS", "50")),
+            ),
+            compaction_interval=3600
+        )
+        
+        # Scaffold found by the last prepare_inputs() call, as (entry, similarity)
+        self.scaffold_match = None
     
+    def agent_code_dir(self, agent_type: str) -> str:
+        """Directory where the code for the given agent type is generated"""
+        return os.path.join(self.code_output_dir, agent_type.lower().replace(' ', '_'))
+
     @before_kickoff
     def prepare_inputs(self, inputs):
         """Prepare inputs before crew execution"""
@@ -77,13 +109,27 @@ class LangGraphCoderCrew:
         if 'code_output_dir' not in inputs:
             inputs['code_output_dir'] = self.code_output_dir
         
+        self.scaffold_match = None
+        
         # Create agent-specific output directory
         if 'agent_type' in inputs and inputs['agent_type']:
-            agent_type = inputs['agent_type'].lower().replace(' ', '_')
-            agent_code_dir = os.path.join(self.code_output_dir, agent_type)
+            agent_code_dir = self.agent_code_dir(inputs['agent_type'])
+            
+            # Offer the nearest previously generated, validated package as a starting point
+            scaffolds = ScaffoldIndex(self.code_output_dir)
+            scaffolds.refresh()
+            self.scaffold_match = scaffolds.nearest(inputs['agent_type'])
+            if self.scaffold_match:
+                inputs['scaffold_context'] = ScaffoldIndex.describe(*self.scaffold_match, output_dir=agent_code_dir)
+                print(f"Using scaffold: {self.scaffold_match[0].package_dir} (similarity {self.scaffold_match[1]:.2f})")
+            
             os.makedirs(agent_code_dir, exist_ok=True)
             inputs['agent_code_dir'] = agent_code_dir
         
+        inputs.setdefault('scaffold_context', "No similar previously generated agent exists; write the package from scratch.")
+        inputs.setdefault('review_feedback', "None yet.")
+        inputs.setdefault('documentation', "Not available.")
+        
         print(f"Code output directory: {self.code_output_dir}")
         return inputs
     
@@ -112,11 +158,15 @@ class LangGraphCoderCrew:
             llm=llm1,
             max_iter=6,
             tools=[
-                SerperDevTool(
-                    search_url="https://google.serper.dev/search",
-                    n_results=8,
-                    
-                )
+                CachedSearchTool(
+                    search_tool=SerperDevTool(
+                        search_url="https://google.serper.dev/search",
+                        n_results=8,
+                    ),
+                    cache_dir=".cache/search",
+                    knowledge_dir="knowledge"
+                ),
+                KnowledgeStoreReadTool()
             ]
         )
     
@@ -130,7 +180,11 @@ class LangGraphCoderCrew:
             max_iter=8,
             allow_code_execution=True,
             tools=[
-                FileWriterTool()
+                PackageWriterTool(root_dir=self.code_output_dir),
+                FileWriterTool(),
+                FileReadTool(),
+                KnowledgeStoreReadTool(),
+                GraphValidatorTool()
             ]
         )
     
@@ -160,6 +214,10 @@ class LangGraphCoderCrew:
             create_directory=True
         )
     
+    def long_term_memory(self) -> LongTermMemory:
+        """Long-term memory shared by the crews"""
+        return LongTermMemory(storage=self.memory_storage)
+    
     @crew
     def crew(self) -> Crew:
         """Creates the LangGraph Coder Crew"""
@@ -169,9 +227,242 @@ class LangGraphCoderCrew:
             verbose=True,
             planning=True,
             process=Process.sequential,
-            long_term_memory=LongTermMemory(
-                storage=ltm_sqlite_storage.LTMSQLiteStorage(
-                    db_path="memory/audience_memory.db"
-                )
+            long_term_memory=self.long_term_memory()
+        )
+    
+    def planning_crew(self, human_input: bool = True) -> Crew:
+        """Creates a crew that stops after the concept plan, for best-of-N code generation
+        
+        With human_input False the plan is returned without asking at the terminal,
+        for review through the approval queue instead.
+        """
+        plan_task = self.plan_langgraph_concepts()
+        if not human_input:
+            plan_task = Task(
+                config=self.tasks_config["plan_langgraph_concepts"],
+                agent=self.langgraph_concept_planner(),
+                human_input=False
             )
+        return Crew(
+            agents=[self.documentation_processor(), self.langgraph_concept_planner()],
+            tasks=[self.process_documentation(), plan_task],
+            verbose=True,
+            planning=True,
+            process=Process.sequential,
+            long_term_memory=self.long_term_memory()
+        )
+    
+    def revision_crew(self) -> Crew:
+        """Creates a single-task crew that revises a rejected concept plan"""
+        planner = self.langgraph_concept_planner()
+        return Crew(
+            agents=[planner],
+            tasks=[Task(config=self.tasks_config["revise_langgraph_concepts"], agent=planner)],
+            verbose=True,
+            process=Process.sequential
+        )
+    
+    def candidate_crew(self, candidate_llm: LLM, candidates_dir: str) -> Crew:
+        """Creates a single-task crew that generates one code candidate with the given model
+        
+        The package writer of the crew can only write directly inside candidates_dir.
+        """
+        coder = Agent(
+            config=self.agents_config["langgraph_coder"],
+            verbose=True,
+            max_rpm=20,
+            llm=candidate_llm,
+            max_iter=8,
+            allow_code_execution=True,
+            tools=[
+                PackageWriterTool(root_dir=candidates_dir),
+                FileWriterTool(),
+                FileReadTool(),
+                KnowledgeStoreReadTool(),
+                GraphValidatorTool()
+            ]
+        )
+        return Crew(
+            agents=[coder],
+            tasks=[Task(config=self.tasks_config["generate_code_candidate"], agent=coder)],
+            verbose=True,
+            process=Process.sequential
         )
+    
+    def generate_code_candidates(self, inputs: Dict, concept_plan: str, count: int,
+                                 candidates_dir: Optional[str] = None) -> Dict[str, CrewOutput]:
+        """Generates code candidates concurrently, one crew per candidate
+        
+        Returns:
+            Mapping of candidate directory to the output of the crew that generated it
+        """
+        if candidates_dir is None:
+            candidates_dir = os.path.join(self.code_output_dir, ".candidates", os.path.basename(inputs['agent_code_dir']))
+        shutil.rmtree(candidates_dir, ignore_errors=True)
+        
+        def generate(index: int) -> Tuple[str, CrewOutput]:
+            candidate_dir = os.path.join(candidates_dir, f"candidate_{index + 1}")
+            candidate_inputs = dict(inputs, agent_code_dir=candidate_dir, concept_plan=concept_plan)
+            if self.scaffold_match:
+                # Candidates start empty, so the scaffold is copied in through base_dir
+                candidate_inputs['scaffold_context'] = ScaffoldIndex.describe(*self.scaffold_match, output_dir=candidate_dir)
+            candidate_llm = candidate_llms[index % len(candidate_llms)]
+            return candidate_dir, self.candidate_crew(candidate_llm, candidates_dir).kickoff(inputs=candidate_inputs)
+        
+        outputs = {}
+        with ThreadPoolExecutor(max_workers=count) as executor:
+            futures = [executor.submit(generate, index) for index in range(count)]
+        for index, future in enumerate(futures):
+            try:
+                candidate_dir, output = future.result()
+                outputs[candidate_dir] = output
+            except Exception as e:
+                print(f"Code candidate {index + 1} failed: {e}")
+        return outputs
+    
+    def kickoff_best_of_n(self, inputs: Dict, count: int) -> Tuple[CrewOutput, List[CandidateScore], List[str]]:
+        """Plans once, generates code candidates in parallel and keeps the best one
+        
+        Candidates are scored locally (compiles, imports, graph compiles and validates,
+        smoke run passes, size) and the winner is written to the agent code directory,
+        unless it fails one of the required checks.
+        
+        Returns:
+            The output of the crew that generated the best candidate, all scores, best
+            first, and the errors that kept the best candidate from being installed
+        """
+        inputs = self.prepare_inputs(dict(inputs))
+        plan = self.planning_crew().kickoff(inputs=inputs)
+        inputs['documentation'] = plan.tasks_output[0].raw
+        try:
+            output, scores = self.generate_and_score(inputs, plan.raw, count)
+        except RuntimeError as e:
+            return plan, [], [str(e)]
+        try:
+            self.install_candidate(inputs, scores[0])
+        except ValueError as e:
+            print(e)
+            return output, scores, [str(e)]
+        return output, scores, []
+    
+    def generate_and_score(self, inputs: Dict, concept_plan: str, count: int,
+                           candidates_dir: Optional[str] = None) -> Tuple[CrewOutput, List[CandidateScore]]:
+        """Generates code candidates and scores them
+        
+        Returns:
+            The output of the crew that generated the best candidate and all scores, best first
+        """
+        outputs = self.generate_code_candidates(inputs, concept_plan, count, candidates_dir)
+        if not outputs:
+            raise RuntimeError("No code candidate was generated")
+        
+        scores = score_candidates(list(outputs))
+        for score in scores:
+            print(f"Candidate {os.path.basename(score.package_dir)}: {score.points} points, {len(score.errors)} error(s)")
+        return outputs[scores[0].package_dir], scores
+    
+    def install_candidate(self, inputs: Dict, score: CandidateScore) -> None:
+        """Writes a scored candidate to the agent code directory
+        
+        Raises:
+            ValueError: If the candidate fails a required check; the agent code directory is left as it is
+        """
+        if not score.installable:
+            failed = ", ".join(check for check in REQUIRED_CHECKS if not score.checks[check])
+            reasons = "; ".join(score.errors) or "no package was written"
+            raise ValueError(f"Not installing {os.path.basename(score.package_dir)} ({score.points} points): "
+                             f"it fails {failed} ({reasons})")
+        write_package(inputs['agent_code_dir'], read_package(score.package_dir), root_dir=self.code_output_dir)
+        print(f"Selected {os.path.basename(score.package_dir)} for {inputs['agent_code_dir']}")
+    
+    def kickoff_with_async_approval(self, inputs: Dict, queue: ApprovalQueue, count: int = 1, max_rounds: int = 3,
+                                    timeout: Optional[float] = None) -> Tuple[CrewOutput, List[CandidateScore], List[ApprovalDecision]]:
+        """Runs the crew with approval gates that do not block on the terminal
+        
+        The concept plan and the generated code are submitted to the approval queue.
+        While the reviewer reads the plan, code for it is already being generated; a
+        rejected plan is revised with the reviewer's feedback and its speculative code is
+        discarded. Rejected code is regenerated with the feedback, and code failing the
+        required checks is regenerated without asking the reviewer. Nothing is written to
+        the agent code directory before the code is approved.
+        
+        Returns:
+            The output of the crew that generated the approved code, its candidate scores
+            and every decision, in order
+        """
+        inputs = self.prepare_inputs(dict(inputs))
+        agent_type = inputs['agent_type']
+        candidates_root = os.path.join(self.code_output_dir, ".candidates", os.path.basename(inputs['agent_code_dir']))
+        # Discarded rounds cannot be interrupted mid-task, so they may still be running next to the current one
+        executor = ThreadPoolExecutor(max_workers=max_rounds + 1)
+        decisions: List[ApprovalDecision] = []
+        rounds = 0
+        
+        def speculate(plan: str, feedback: str) -> Tuple[Future, str, float]:
+            nonlocal rounds
+            rounds += 1
+            round_dir = os.path.join(candidates_root, f"round_{rounds}")
+            round_inputs = dict(inputs, review_feedback=feedback or "None yet.")
+            future = executor.submit(self.generate_and_score, round_inputs, plan, count, round_dir)
+            return future, round_dir, time.monotonic()
+        
+        def discard(future: Future, round_dir: str) -> None:
+            if not future.cancel():
+                future.add_done_callback(lambda _: shutil.rmtree(round_dir, ignore_errors=True))
+        
+        def review(stage: str, content: str) -> ApprovalDecision:
+            request = queue.submit(stage, content, agent_type)
+            print(f"Waiting for approval of the {stage}: approve show {request.id}")
+            decision = queue.wait(request.id, timeout=timeout)
+            decisions.append(decision)
+            print(f"{stage.capitalize()} {'approved' if decision.approved else 'rejected'} "
+                  f"after {decision.decided_at - request.created_at:.0f}s")
+            return decision
+        
+        try:
+            planning = self.planning_crew(human_input=False).kickoff(inputs=inputs)
+            inputs['documentation'] = planning.tasks_output[0].raw
+            plan = planning.raw
+            for plan_round in range(1, max_rounds + 1):
+                # Reviewer think-time on the plan overlaps with code generation for it
+                future, round_dir, started = speculate(plan, "")
+                decision = review("plan", plan)
+                if decision.approved:
+                    break
+                discard(future, round_dir)
+                if plan_round == max_rounds:
+                    raise RuntimeError(f"The concept plan was rejected {max_rounds} times")
+                plan = self.revision_crew().kickoff(
+                    inputs=dict(inputs, concept_plan=plan, review_feedback=decision.feedback or "None given.")
+                ).raw
+            
+            for code_round in range(1, max_rounds + 1):
+                output, scores = future.result()
+                print(f"Code generation took {time.monotonic() - started:.0f}s")
+                best = scores[0]
+                if not best.installable:
+                    # Code that cannot be installed is not worth the reviewer's time; it is regenerated right away
+                    print(f"Code round {code_round} failed the required checks; regenerating")
+                    discard(future, round_dir)
+                    if code_round == max_rounds:
+                        raise RuntimeError(f"No generated code passed the required checks in {max_rounds} rounds")
+                    errors = "; ".join(best.errors) or "no package was written"
+                    future, round_dir, started = speculate(plan, f"The code failed the automatic checks: {errors}")
+                    continue
+                files = "\n".join(f"- {path}" for path in read_package(best.package_dir))
+                decision = review(
+                    "code",
+                    f"Generated package: {best.package_dir}\nScore: {best.points} points, "
+                    f"{len(best.errors)} error(s)\n" + "".join(f"  ! {error}\n" for error in best.errors) +
+                    f"Files:\n{files}\n\nOutput:\n{output.raw}"
+                )
+                if decision.approved:
+                    self.install_candidate(inputs, best)
+                    return output, scores, decisions
+                # The rejected round is finished, so its candidates are removed right away
+                discard(future, round_dir)
+                if code_round == max_rounds:
+                    raise RuntimeError(f"The generated code was rejected {max_rounds} times")
+                future, round_dir, started = speculate(plan, decision.feedback or "The reviewer rejected the code.")
+        finally:
+            executor.shutdown(wait=False)
@@ -0,0 +1,150 @@
+"""Helpers for importing the graph factory of a package under generated_code/.
+
+Generated packages are laid out like ``generated_code/<agent_type>/`` with a ``main.py``
+and a ``src`` package holding the graph definition. Every package reuses the same
+top-level module names (``src``, ``main``), so they are imported with the package
+directory temporarily placed first on ``sys.path`` and their modules removed again
+afterwards.
+"""
+import ast
+import contextlib
+import importlib
+import os
+import sys
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+# Directories that never contain the graph definition
+SKIPPED_DIRS = {"__pycache__", "tests", "test", ".venv", "venv", ".candidates"}
+
+
+def _iter_python_files(package_dir: str) -> Iterator[str]:
+    """Yields the Python files of a generated package, relative to its root."""
+    for root, dirs, files in os.walk(package_dir):
+        dirs[:] = sorted(d for d in dirs if d not in SKIPPED_DIRS and not d.startswith("."))
+        for file in sorted(files):
+            if file.endswith(".py"):
+                yield os.path.relpath(os.path.join(root, file), package_dir)
+
+
+def _module_name(relative_path: str) -> str:
+    """Converts ``src/graph.py`` into ``src.graph``."""
+    module = relative_path[:-3].replace(os.sep, ".")
+    if module.endswith(".__init__"):
+        module = module[: -len(".__init__")]
+    return module
+
+
+def _builds_state_graph(node: ast.FunctionDef) -> bool:
+    """Returns True if the function is annotated to return, or constructs, a StateGraph."""
+    returns = node.returns
+    if returns is not None and "StateGraph" in ast.unparse(returns):
+        return True
+    for child in ast.walk(node):
+        if isinstance(child, ast.Call):
+            func = child.func
+            name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+            if name == "StateGraph":
+                return True
+    return False
+
+
+def find_graph_factories(package_dir: str) -> List[str]:
+    """Statically lists the graph factories of a generated package.
+
+    Args:
+        package_dir: Root directory of the generated package
+
+    Returns:
+        ``module:function`` references, most likely candidates first
+    """
+    factories = []
+    for relative_path in _iter_python_files(package_dir):
+        try:
+            with open(os.path.join(package_dir, relative_path), "r", encoding="utf-8") as f:
+                tree = ast.parse(f.read())
+        except (SyntaxError, UnicodeDecodeError):
+            continue
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef) and _builds_state_graph(node):
+                factories.append(f"{_module_name(relative_path)}:{node.name}")
+
+    def rank(reference: str) -> Tuple[int, int, str]:
+        module, function = reference.split(":")
+        named_like_factory = function.startswith(("create_", "build_", "make_", "get_")) and "graph" in function
+        return (0 if named_like_factory else 1, 0 if module.endswith("graph") else 1, reference)
+
+    return sorted(factories, key=rank)
+
+
+@contextlib.contextmanager
+def package_on_path(package_dir: str) -> Iterator[None]:
+    """Makes a generated package importable for the duration of the block.
+
+    Modules already imported under the same top-level names (e.g. another package's
+    ``src``) are stashed and restored afterwards, so packages never see each other.
+    """
+    package_dir = os.path.abspath(package_dir)
+    top_level = {_module_name(path).split(".")[0] for path in _iter_python_files(package_dir)}
+
+    def owned(name: str) -> bool:
+        return name.split(".")[0] in top_level
+
+    stashed = {name: module for name, module in sys.modules.items() if owned(name)}
+    for name in stashed:
+        del sys.modules[name]
+    sys.path.insert(0, package_dir)
+    importlib.invalidate_caches()
+    try:
+        yield
+    finally:
+        if package_dir in sys.path:
+            sys.path.remove(package_dir)
+        for name in [name for name in sys.modules if owned(name)]:
+            del sys.modules[name]
+        sys.modules.update(stashed)
+
+
+def load_graph_factory(package_dir: str, factory: Optional[str] = None) -> Tuple[Callable[[], Any], str]:
+    """Imports the graph factory of a generated package.
+
+    Must be called inside ``package_on_path(package_dir)``.
+
+    Args:
+        package_dir: Root directory of the generated package
+        factory: ``module:function`` or bare function name; discovered when omitted
+
+    Returns:
+        The factory callable and its ``module:function`` reference
+    """
+    candidates = find_graph_factories(package_dir)
+    if factory:
+        if ":" not in factory:
+            matches = [ref for ref in candidates if ref.split(":")[1] == factory]
+            if not matches:
+                raise LookupError(f"No graph factory named '{factory}' found in {package_dir}")
+            factory = matches[0]
+        candidates = [factory]
+    if not candidates:
+        raise LookupError(f"No function building a StateGraph found in {package_dir}")
+
+    reference = candidates[0]
+    module_name, function_name = reference.split(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, function_name), reference
+
+
+def build_graph(factory: Callable[[], Any]) -> Any:
+    """Calls a graph factory and returns the uncompiled StateGraph.
+
+    Factories either return the StateGraph builder or an already compiled graph;
+    for the latter the builder is recovered from the compiled graph.
+    """
+    graph = factory()
+    builder = getattr(graph, "builder", None)
+    return builder if builder is not None else graph
+
+
+def compile_graph(factory: Callable[[], Any]) -> Any:
+    """Calls a graph factory and returns a compiled, runnable graph."""
+    graph = factory()
+    return graph.compile() if hasattr(graph, "add_node") else graph
@@ -0,0 +1,393 @@
+#!/usr/bin/env python
+"""Load-test harness for the LangGraph agents under generated_code/.
+
+Discovers the graph factory of a generated package, builds synthetic inputs from the
+argparse defaults in its ``main.py`` and drives concurrent runs of the compiled graph
+against a stubbed LLM, reporting throughput, per-node and end-to-end latency
+percentiles, error rate and peak memory.
+
+Example:
+    loadtest a_likendin_post_creator_for_any_topic --runs 200 --concurrency 20
+"""
+import argparse
+import ast
+import contextlib
+import copy
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from coder_ai.graph_loader import compile_graph, load_graph_factory, package_on_path
+from coder_ai.metrics import LatencyStats
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows; peak RSS is then reported as 0
+    resource = None
+
+GENERATED_CODE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../generated_code"))
+
+# Provider keys some chat model constructors insist on, even when the model is stubbed
+STUB_API_KEYS = ("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "GOOGLE_API_KEY", "GROQ_API_KEY", "OPENROUTER_API_KEY")
+
+
+def argparse_defaults(main_path: str) -> Dict[str, Any]:
+    """Statically reads the defaults of the ``add_argument`` calls in a generated main.py.
+
+    Args:
+        main_path: Path to the package's main.py
+
+    Returns:
+        Mapping of argument destination (e.g. ``needs_revision``) to its default value
+    """
+    if not os.path.exists(main_path):
+        return {}
+    with open(main_path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+
+    defaults = {}
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and getattr(node.func, "attr", None) == "add_argument"):
+            continue
+        options = [arg.value for arg in node.args if isinstance(arg, ast.Constant) and isinstance(arg.value, str)]
+        if not options:
+            continue
+        keywords = {kw.arg: kw.value for kw in node.keywords if kw.arg}
+        if "dest" in keywords and isinstance(keywords["dest"], ast.Constant):
+            dest = keywords["dest"].value
+        else:
+            long_options = [option for option in options if option.startswith("--")]
+            dest = (long_options or options)[0].lstrip("-").replace("-", "_")
+
+        action = keywords.get("action")
+        action = action.value if isinstance(action, ast.Constant) else None
+        if "default" in keywords:
+            try:
+                defaults[dest] = ast.literal_eval(keywords["default"])
+            except ValueError:
+                continue
+        elif action in ("store_true", "store_false"):
+            defaults[dest] = action == "store_false"
+    return defaults
+
+
+def _empty_value(annotation: Any) -> Any:
+    """Neutral value for a state field of the given type."""
+    origin = typing.get_origin(annotation)
+    if origin is typing.Annotated:
+        return _empty_value(typing.get_args(annotation)[0])
+    if origin is typing.Union:
+        return None
+    container = origin or annotation
+    for kind in (list, dict, set, tuple, str, bool, int, float):
+        if container is kind or (isinstance(container, type) and issubclass(container, kind)):
+            return kind()
+    return None
+
+
+def build_initial_state(graph: Any, inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Builds a complete initial state for a graph from its state schema and the given inputs."""
+    builder = getattr(graph, "builder", graph)
+    schema = getattr(builder, "state_schema", None) or getattr(builder, "schema", None)
+    try:
+        hints = typing.get_type_hints(schema, include_extras=True) if schema else {}
+    except Exception:
+        hints = getattr(schema, "__annotations__", {})
+    state = {name: _empty_value(annotation) for name, annotation in hints.items()}
+    state.update({key: value for key, value in inputs.items() if not hints or key in hints})
+    return state
+
+
+@contextlib.contextmanager
+def stub_llms(latency: float = 0.0) -> Iterator[None]:
+    """Replaces every LangChain chat model and LLM call with a canned offline response.
+
+    ``invoke``/``ainvoke`` and ``stream``/``astream`` are replaced directly; every other
+    entry point (``batch``, ``generate``, ``generate_prompt`` and their async variants)
+    funnels into the generation layer below them, which is replaced as well.
+
+    Args:
+        latency: Seconds each stubbed call sleeps, to mimic model latency
+    """
+    try:
+        from langchain_core.language_models import BaseChatModel, BaseLLM
+        from langchain_core.messages import AIMessage
+        from langchain_core.outputs import ChatGeneration, ChatResult, Generation, LLMResult
+    except ImportError:
+        yield
+        return
+
+    def text(self) -> str:
+        time.sleep(latency)
+        return f"[stubbed {type(self).__name__} response]"
+
+    def respond(self, input, config=None, **kwargs):
+        return AIMessage(content=text(self)) if isinstance(self, BaseChatModel) else text(self)
+
+    async def arespond(self, input, config=None, **kwargs):
+        return respond(self, input, config, **kwargs)
+
+    def stream(self, input, config=None, **kwargs):
+        yield respond(self, input, config, **kwargs)
+
+    async def astream(self, input, config=None, **kwargs):
+        yield respond(self, input, config, **kwargs)
+
+    def chat_result(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=text(self)))])
+
+    async def achat_result(self, messages, stop=None, run_manager=None, **kwargs):
+        return chat_result(self, messages, stop, run_manager, **kwargs)
+
+    def llm_result(self, prompts, stop, run_managers, *, new_arg_supported=True, **kwargs):
+        return LLMResult(generations=[[Generation(text=text(self))] for _ in prompts])
+
+    async def allm_result(self, prompts, stop, run_managers, *, new_arg_supported=True, **kwargs):
+        return llm_result(self, prompts, stop, run_managers, **kwargs)
+
+    public = (("invoke", respond), ("ainvoke", arespond), ("stream", stream), ("astream", astream))
+    replacements = {
+        BaseChatModel: public + (("_generate_with_cache", chat_result), ("_agenerate_with_cache", achat_result)),
+        BaseLLM: public + (("_generate_helper", llm_result), ("_agenerate_helper", allm_result)),
+    }
+    patched = {}
+    for cls, methods in replacements.items():
+        for name, replacement in methods:
+            patched[(cls, name)] = cls.__dict__.get(name)
+            setattr(cls, name, replacement)
+    missing_keys = [key for key in STUB_API_KEYS if key not in os.environ]
+    for key in missing_keys:
+        os.environ[key] = "stub"
+    try:
+        yield
+    finally:
+        for (cls, name), original in patched.items():
+            if original is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+        for key in missing_keys:
+            os.environ.pop(key, None)
+
+
+def _node_timer_class():
+    """Builds the node timing callback handler; langchain_core is only needed at run time."""
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class NodeTimer(BaseCallbackHandler):
+        """Records the wall-clock duration of every graph node execution."""
+
+        def __init__(self):
+            self._lock = threading.Lock()
+            self._started: Dict[UUID, tuple] = {}
+            self.durations: Dict[str, List[float]] = {}
+
+        def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+            node = (metadata or {}).get("langgraph_node")
+            # Routing functions and nested runnables share the node's metadata; only time the node itself
+            if node and kwargs.get("name") == node and not node.startswith("__"):
+                with self._lock:
+                    self._started[run_id] = (node, time.perf_counter())
+
+        def _finish(self, run_id):
+            with self._lock:
+                started = self._started.pop(run_id, None)
+                if started:
+                    node, start = started
+                    self.durations.setdefault(node, []).append(time.perf_counter() - start)
+
+        def on_chain_end(self, outputs, *, run_id, **kwargs):
+            self._finish(run_id)
+
+        def on_chain_error(self, error, *, run_id, **kwargs):
+            self._finish(run_id)
+
+    return NodeTimer
+
+
+class LoadTestReport(BaseModel):
+    """Results of a load test against a generated graph."""
+
+    package_dir: str
+    factory: str
+    runs: int
+    concurrency: int
+    duration: float = 0.0  # Wall-clock seconds for all runs
+    throughput: float = 0.0  # Completed runs per second
+    errors: int = 0
+    error_rate: float = 0.0
+    error_samples: List[str] = Field(default_factory=list)
+    end_to_end: LatencyStats = Field(default_factory=LatencyStats)
+    nodes: Dict[str, LatencyStats] = Field(default_factory=dict)
+    peak_traced_memory_mb: float = 0.0  # Peak Python allocations of one batch of concurrent runs, traced separately
+    peak_rss_mb: float = 0.0  # Peak resident set size of the process
+
+    def format(self) -> str:
+        """Renders the report as a plain-text table."""
+        def row(name: str, stats: LatencyStats) -> str:
+            return (f"  {name:<32} {stats.count:>7} {stats.p50 * 1000:>10.1f} {stats.p95 * 1000:>10.1f} "
+                    f"{stats.p99 * 1000:>10.1f} {stats.max * 1000:>10.1f}")
+
+        lines = [
+            f"Load test: {self.factory} ({self.package_dir})",
+            f"Runs: {self.runs} at concurrency {self.concurrency} in {self.duration:.2f}s "
+            f"-> {self.throughput:.2f} runs/s",
+            f"Errors: {self.errors} ({self.error_rate:.1%})",
+            f"Peak memory: {self.peak_traced_memory_mb:.1f} MB traced, {self.peak_rss_mb:.1f} MB RSS",
+            "",
+            f"  {'latency (ms)':<32} {'count':>7} {'p50':>10} {'p95':>10} {'p99':>10} {'max':>10}",
+            row("end-to-end", self.end_to_end),
+        ]
+        lines.extend(row(name, stats) for name, stats in sorted(self.nodes.items()))
+        for sample in self.error_samples:
+            lines.append(f"  error: {sample}")
+        return "\n".join(lines)
+
+
+def resolve_package_dir(package: str) -> str:
+    """Accepts a package path or the name of a directory under generated_code/."""
+    if os.path.isdir(package):
+        return os.path.abspath(package)
+    candidate = os.path.join(GENERATED_CODE_DIR, package)
+    if os.path.isdir(candidate):
+        return candidate
+    raise FileNotFoundError(f"No generated package found at '{package}' or '{candidate}'")
+
+
+def run_load_test(
+    package_dir: str,
+    runs: int = 50,
+    concurrency: int = 10,
+    factory: Optional[str] = None,
+    inputs: Optional[Dict[str, Any]] = None,
+    llm_latency: float = 0.0,
+    recursion_limit: int = 50,
+) -> LoadTestReport:
+    """Drives concurrent runs of a generated graph and measures them.
+
+    Args:
+        package_dir: Root directory of the generated package
+        runs: Total number of graph runs
+        concurrency: Number of runs in flight at once
+        factory: Optional 'module:function' reference of the graph factory
+        inputs: State values overriding the argparse defaults of main.py
+        llm_latency: Seconds each stubbed LLM call takes
+        recursion_limit: LangGraph recursion limit per run
+
+    Returns:
+        The load test report
+    """
+    package_dir = resolve_package_dir(package_dir)
+    synthetic_inputs = argparse_defaults(os.path.join(package_dir, "main.py"))
+    synthetic_inputs.update(inputs or {})
+
+    with package_on_path(package_dir), stub_llms(llm_latency):
+        graph_factory, reference = load_graph_factory(package_dir, factory)
+        app = compile_graph(graph_factory)
+        initial_state = build_initial_state(app, synthetic_inputs)
+        timer = _node_timer_class()()
+        report = LoadTestReport(package_dir=package_dir, factory=reference, runs=runs, concurrency=concurrency)
+        latencies: List[float] = []
+        failures: List[str] = []
+        lock = threading.Lock()
+
+        def run_once(_: int) -> None:
+            state = copy.deepcopy(initial_state)
+            started = time.perf_counter()
+            error = None
+            try:
+                final_state = app.invoke(state, config={"callbacks": [timer], "recursion_limit": recursion_limit})
+                if isinstance(final_state, dict) and final_state.get("error_message"):
+                    error = str(final_state["error_message"])
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                if error:
+                    failures.append(error)
+
+        def run_traced(_: int) -> None:
+            try:
+                app.invoke(copy.deepcopy(initial_state), config={"recursion_limit": recursion_limit})
+            except Exception:
+                pass
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(run_once, range(runs)))
+        report.duration = time.perf_counter() - started
+
+        # Tracing slows down every allocation, so memory is measured in a separate, untimed batch
+        tracemalloc.start()
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                list(executor.map(run_traced, range(min(runs, concurrency))))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    report.throughput = runs / report.duration if report.duration else 0.0
+    report.errors = len(failures)
+    report.error_rate = report.errors / runs if runs else 0.0
+    report.error_samples = sorted(set(failures))[:5]
+    report.end_to_end = LatencyStats.from_samples(latencies)
+    report.nodes = {node: LatencyStats.from_samples(samples) for node, samples in timer.durations.items()}
+    report.peak_traced_memory_mb = peak / (1024 * 1024)
+    if resource is not None:
+        # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        report.peak_rss_mb = max_rss / (1024 * 1024) if sys.platform == "darwin" else max_rss / 1024
+    return report
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Load-test a generated LangGraph agent with a stubbed LLM.")
+    parser.add_argument("package", help="Package directory, or the name of a directory under generated_code/.")
+    parser.add_argument("--runs", type=int, default=50, help="Total number of graph runs.")
+    parser.add_argument("--concurrency", type=int, default=10, help="Number of concurrent runs.")
+    parser.add_argument("--factory", help="Graph factory as 'module:function'. Discovered if omitted.")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=JSON",
+                        help="Override an input value, e.g. --set 'keywords=[\"AI\"]'. Repeatable.")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds each stubbed LLM call takes.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    parser.add_argument("--verbose", action="store_true", help="Keep the generated agent's INFO logs.")
+    args = parser.parse_args()
+
+    inputs = {}
+    for assignment in args.set:
+        key, _, value = assignment.partition("=")
+        try:
+            inputs[key] = json.loads(value)
+        except json.JSONDecodeError:
+            inputs[key] = value
+
+    if not args.verbose:
+        # Generated agents log every node, which would drown the report; failures are counted in it
+        logging.disable(logging.ERROR)
+
+    report = run_load_test(
+        args.package,
+        runs=args.runs,
+        concurrency=args.concurrency,
+        factory=args.factory,
+        inputs=inputs,
+        llm_latency=args.llm_latency,
+    )
+    print(report.model_dump_json(indent=2) if args.json else report.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,10 @@ from dotenv import load_dotenv
 
 from crewai.flow import Flow, listen, start
 
+from coder_ai.tools.graph_validator_tool import validate_package
+from coder_ai.scaffolds import ScaffoldIndex
+from coder_ai.approvals import ApprovalQueue, serve_approvals
+
 # Load environment variables
 load_dotenv()
 
@@ -38,6 +42,15 @@ class LangGraphCoderState(BaseModel):
     # Execution results
     execution_results: Optional[str] = None  # Results from code execution
     execution_status: Optional[bool] = None  # Whether execution was successful
+    graph_valid: Optional[bool] = None  # Whether the generated graph passed topology validation
+    
+    # Best-of-N code generation
+    code_candidates: int = 1  # Number of code candidates generated in parallel (CODE_CANDIDATES env var)
+    candidate_scores: Dict[str, int] = Field(default_factory=dict)  # Local score per candidate directory
+    
+    # Approval gates
+    approval_mode: str = "terminal"  # "terminal" (human_input) or "async" (approval queue, APPROVAL_MODE env var)
+    approvals: List[str] = Field(default_factory=list)  # Decisions made through the approval queue
     
     # Additional metadata
     errors: List[str] = Field(default_factory=list)  # Any errors encountered during the process
@@ -51,6 +64,8 @@ class LangGraphCoderFlow(Flow[LangGraphCoderState]):
         """Get the type of AI agent to build with LangGraph."""
         print("\n=== LangGraph Coder ===\n")
         self.state.agent_type = input("What type of AI agent would you like to build with LangGraph? (e.g., sports betting, social media, etc.): ")
+        self.state.code_candidates = max(1, int(os.environ.get("CODE_CANDIDATES", "1")))
+        self.state.approval_mode = os.environ.get("APPROVAL_MODE", "terminal").lower()
         self.state.completion_percentage = 10.0
         return self.state.agent_type
 
@@ -64,9 +79,40 @@ class LangGraphCoderFlow(Flow[LangGraphCoderState]):
         langgraph_crew = LangGraphCoderCrew()
         
         # Prepare the crew by setting up knowledge directories
-        result = langgraph_crew.crew().kickoff(
-            inputs={"agent_type": self.state.agent_type}
-        )
+        if self.state.approval_mode == "async":
+            # Approvals come from the queue, and code generation starts while the plan is reviewed
+            queue = ApprovalQueue()
+            server = None
+            if os.environ.get("APPROVAL_PORT"):
+                server = serve_approvals(queue, port=int(os.environ["APPROVAL_PORT"]))
+                print(f"Approval endpoint: http://127.0.0.1:{server.server_port}/approvals")
+            print(f"Review requests with 'approve list' (queue: {queue.directory})")
+            try:
+                result, scores, decisions = langgraph_crew.kickoff_with_async_approval(
+                    inputs={"agent_type": self.state.agent_type},
+                    queue=queue,
+                    count=self.state.code_candidates
+                )
+            finally:
+                if server:
+                    server.shutdown()
+            self.state.candidate_scores = {score.package_dir: score.points for score in scores}
+            self.state.approvals = [
+                f"{decision.id}: {'approved' if decision.approved else 'rejected'} {decision.feedback}".rstrip()
+                for decision in decisions
+            ]
+        elif self.state.code_candidates > 1:
+            # Generate several candidates concurrently and keep the best scoring one
+            result, scores, install_errors = langgraph_crew.kickoff_best_of_n(
+                inputs={"agent_type": self.state.agent_type},
+                count=self.state.code_candidates
+            )
+            self.state.candidate_scores = {score.package_dir: score.points for score in scores}
+            self.state.errors.extend(install_errors)
+        else:
+            result = langgraph_crew.crew().kickoff(
+                inputs={"agent_type": self.state.agent_type}
+            )
         
         # Update the state with results from the crew
         self.state.completion_percentage = 90.0
@@ -84,6 +130,8 @@ class LangGraphCoderFlow(Flow[LangGraphCoderState]):
             self.state.code_output_dir = result.code_output_dir
         elif hasattr(result, 'agent_code_dir'):
             self.state.code_output_dir = result.agent_code_dir
+        else:
+            self.state.code_output_dir = langgraph_crew.agent_code_dir(self.state.agent_type)
             
         # If we have a code output directory, scan it for files
         if self.state.code_output_dir and os.path.exists(self.state.code_output_dir):
@@ -111,7 +159,19 @@ class LangGraphCoderFlow(Flow[LangGraphCoderState]):
             self.state.execution_status = result.execution_status
             
         if hasattr(result, 'errors') and isinstance(result.errors, list):
-            self.state.errors = result.errors
+            self.state.errors.extend(result.errors)
+        
+        # Validate the generated graph topology before anyone runs it
+        if self.state.code_files:
+            report = validate_package(self.state.code_output_dir)
+            print(f"\n{report.format()}")
+            self.state.graph_valid = report.ok
+            self.state.errors.extend(report.errors)
+            
+            # Make the package available as a scaffold for similar requests
+            scaffolds = ScaffoldIndex(langgraph_crew.code_output_dir)
+            scaffolds.add(self.state.code_output_dir, self.state.agent_type, validated=report.ok)
+            scaffolds.save()
         
         self.state.completion_percentage = 100.0
         return result.raw
@@ -151,6 +211,20 @@ class LangGraphCoderFlow(Flow[LangGraphCoderState]):
             status = "Success" if self.state.execution_status else "Failed"
             print(f"Execution Status: {status}")
             
+        if self.state.candidate_scores:
+            print(f"Code Candidates: {len(self.state.candidate_scores)} scored")
+            for path, points in self.state.candidate_scores.items():
+                print(f"  - {path}: {points} points")
+            
+        if self.state.approvals:
+            print(f"Approvals: {len(self.state.approvals)} decision(s)")
+            for decision in self.state.approvals:
+                print(f"  - {decision}")
+            
+        if self.state.graph_valid is not None:
+            status = "Passed" if self.state.graph_valid else "Failed"
+            print(f"Graph Validation: {status}")
+            
         if self.state.errors:
             print(f"Errors: {len(self.state.errors)} error(s) encountered")
             for error in self.state.errors:
@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+"""Long-term memory storage with bounded retention and background compaction.
+
+CrewAI's ``LTMSQLiteStorage`` appends a row to ``long_term_memories`` after every task
+of every kickoff and never deletes any, and lookups by task description scan the whole
+table. ``BoundedLTMStorage`` keeps the same schema and interface but indexes lookups,
+merges near-identical memories, enforces a retention policy per task (age, count,
+minimum score) and compacts the database file in the background, so lookup cost and
+file size stay flat in long-lived deployments.
+
+Example:
+    memory memory/audience_memory.db --compact
+"""
+import argparse
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from difflib import SequenceMatcher
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+from crewai.memory.storage.ltm_sqlite_storage import LTMSQLiteStorage
+from pydantic import BaseModel
+
+from coder_ai.metrics import LatencyStats
+
+# Number of most recent lookups the latency percentiles are computed over
+METRICS_WINDOW = 1000
+
+# Number of newest memories of a task a new memory is compared against when saved
+DEDUP_WINDOW = 50
+
+
+class RetentionPolicy(BaseModel):
+    """How many long-term memories of one task are kept, and for how long."""
+
+    max_age_days: Optional[float] = 90.0  # Memories older than this are deleted
+    max_items: Optional[int] = 50  # Only the newest memories per task are kept
+    min_score: Optional[float] = None  # Memories scored below this are deleted
+    similarity_threshold: float = 0.95  # Memories at least this similar to a newer one are merged into it
+
+
+class BoundedLTMStorage(LTMSQLiteStorage):
+    """Drop-in replacement for ``LTMSQLiteStorage`` with retention and compaction.
+
+    Args:
+        db_path: SQLite database file
+        policy: Retention policy applied to every task
+        task_policies: Policies for specific tasks, keyed by a substring of the task description
+            (e.g. ``"Process the following LangGraph documentation"``)
+        compaction_interval: Seconds between background compactions; 0 disables them
+        vacuum_threshold: Share of free pages in the file above which compaction runs VACUUM
+    """
+
+    def __init__(self, db_path: Optional[str] = None, policy: Optional[RetentionPolicy] = None,
+                 task_policies: Optional[Dict[str, RetentionPolicy]] = None,
+                 compaction_interval: float = 3600, vacuum_threshold: float = 0.2):
+        self.policy = policy or RetentionPolicy()
+        self.task_policies = task_policies or {}
+        self.vacuum_threshold = vacuum_threshold
+        self._lock = threading.Lock()
+        self._lookup_latencies: Deque[float] = deque(maxlen=METRICS_WINDOW)
+        self.deduplicated = 0
+        self.pruned = 0
+        self.last_compaction: Optional[float] = None
+        self._stop = threading.Event()
+        super().__init__(db_path=db_path)
+        if compaction_interval > 0:
+            threading.Thread(target=self._compaction_loop, args=(compaction_interval,),
+                             name="ltm-compaction", daemon=True).start()
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _initialize_db(self) -> None:
+        super()._initialize_db()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_long_term_memories_task "
+                "ON long_term_memories (task_description, datetime)"
+            )
+
+    def policy_for(self, task_description: str) -> RetentionPolicy:
+        """The retention policy of a task: the first matching task policy, else the default."""
+        for key, policy in self.task_policies.items():
+            if key in task_description:
+                return policy
+        return self.policy
+
+    @staticmethod
+    def _content(metadata: Dict[str, Any]) -> str:
+        """The part of a memory compared for deduplication: what was learned, not when."""
+        return json.dumps(metadata.get("suggestions", metadata), sort_keys=True, default=str)
+
+    @staticmethod
+    def _is_duplicate(left: str, right: str, threshold: float) -> bool:
+        matcher = SequenceMatcher(None, left, right, autojunk=False)
+        # The cheap upper bounds rule out most pairs before the quadratic comparison
+        return (matcher.real_quick_ratio() >= threshold and matcher.quick_ratio() >= threshold
+                and matcher.ratio() >= threshold)
+
+    def save(self, task_description: str, metadata: Dict[str, Any], datetime: str,
+             score: Union[int, float]) -> None:
+        """Saves a memory, merging it into a near-identical one of the same task if present."""
+        policy = self.policy_for(task_description)
+        content = self._content(metadata)
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT id, metadata FROM long_term_memories WHERE task_description = ? "
+                    "ORDER BY datetime DESC LIMIT ?",
+                    (task_description, DEDUP_WINDOW),
+                ).fetchall()
+                duplicate = next((row_id for row_id, stored in rows
+                                  if self._is_duplicate(content, self._content(json.loads(stored)), policy.similarity_threshold)),
+                                 None)
+                if duplicate is not None:
+                    # Keep one row carrying the newest version of the memory
+                    conn.execute(
+                        "UPDATE long_term_memories SET metadata = ?, datetime = ?, score = ? WHERE id = ?",
+                        (json.dumps(metadata), datetime, score, duplicate),
+                    )
+                else:
+                    conn.execute(
+                        "INSERT INTO long_term_memories (task_description, metadata, datetime, score) VALUES (?, ?, ?, ?)",
+                        (task_description, json.dumps(metadata), datetime, score),
+                    )
+                pruned = self._prune(conn, task_description, policy)
+            with self._lock:
+                self.deduplicated += duplicate is not None
+                self.pruned += pruned
+        except sqlite3.Error as e:
+            self._printer.print(
+                content=f"MEMORY ERROR: An error occurred while saving to LTM: {e}",
+                color="red",
+            )
+
+    def load(self, task_description: str, latest_n: int) -> Optional[List[Dict[str, Any]]]:
+        """Loads the latest memories of a task through the task index."""
+        started = time.perf_counter()
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT metadata, datetime, score FROM long_term_memories WHERE task_description = ? "
+                    "ORDER BY datetime DESC, score ASC LIMIT ?",
+                    (task_description, latest_n),
+                ).fetchall()
+        except sqlite3.Error as e:
+            self._printer.print(
+                content=f"MEMORY ERROR: An error occurred while querying LTM: {e}",
+                color="red",
+            )
+            return None
+        finally:
+            with self._lock:
+                self._lookup_latencies.append(time.perf_counter() - started)
+        if not rows:
+            return None
+        return [{"metadata": json.loads(row[0]), "datetime": row[1], "score": row[2]} for row in rows]
+
+    def reset(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM long_term_memories")
+
+    @staticmethod
+    def _prune(conn: sqlite3.Connection, task_description: str, policy: RetentionPolicy) -> int:
+        """Deletes the memories of a task that the policy does not retain; returns how many."""
+        deleted = 0
+        if policy.max_age_days is not None:
+            cutoff = time.time() - policy.max_age_days * 86400
+            deleted += conn.execute(
+                "DELETE FROM long_term_memories WHERE task_description = ? AND CAST(datetime AS REAL) < ?",
+                (task_description, cutoff),
+            ).rowcount
+        if policy.min_score is not None:
+            deleted += conn.execute(
+                "DELETE FROM long_term_memories WHERE task_description = ? AND score < ?",
+                (task_description, policy.min_score),
+            ).rowcount
+        if policy.max_items is not None:
+            deleted += conn.execute(
+                "DELETE FROM long_term_memories WHERE task_description = ? AND id NOT IN ("
+                "SELECT id FROM long_term_memories WHERE task_description = ? ORDER BY datetime DESC LIMIT ?)",
+                (task_description, task_description, policy.max_items),
+            ).rowcount
+        return deleted
+
+    def _deduplicate(self, conn: sqlite3.Connection, task_description: str, policy: RetentionPolicy) -> int:
+        """Deletes memories near-identical to a newer one of the same task; returns how many."""
+        kept: List[str] = []
+        duplicates = []
+        for row_id, stored in conn.execute(
+            "SELECT id, metadata FROM long_term_memories WHERE task_description = ? ORDER BY datetime DESC",
+            (task_description,),
+        ):
+            content = self._content(json.loads(stored))
+            if any(self._is_duplicate(content, other, policy.similarity_threshold) for other in kept):
+                duplicates.append((row_id,))
+            else:
+                kept.append(content)
+        conn.executemany("DELETE FROM long_term_memories WHERE id = ?", duplicates)
+        return len(duplicates)
+
+    def compact(self, vacuum: Optional[bool] = None) -> Dict[str, Any]:
+        """Applies retention and deduplication to every task, then reclaims free space.
+
+        Args:
+            vacuum: Force (True) or skip (False) VACUUM; by default it runs when the share of
+                free pages exceeds ``vacuum_threshold``
+
+        Returns:
+            The storage metrics after compaction
+        """
+        with self._connect() as conn:
+            tasks = [row[0] for row in conn.execute("SELECT DISTINCT task_description FROM long_term_memories")]
+            pruned = deduplicated = 0
+            for task_description in tasks:
+                policy = self.policy_for(task_description)
+                # Pruning first bounds the pairwise deduplication to max_items memories per task
+                pruned += self._prune(conn, task_description, policy)
+                deduplicated += self._deduplicate(conn, task_description, policy)
+        with self._lock:
+            self.pruned += pruned
+            self.deduplicated += deduplicated
+
+        page_count, free_pages = self._page_counts()
+        if vacuum or (vacuum is None and page_count and free_pages / page_count > self.vacuum_threshold):
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            try:
+                conn.execute("VACUUM")
+            finally:
+                conn.close()
+        self.last_compaction = time.time()
+        return self.metrics()
+
+    def _compaction_loop(self, interval: float) -> None:
+        # The first pass runs right away, in the background, so kickoff is not delayed
+        while not self._stop.is_set():
+            try:
+                self.compact()
+            except sqlite3.Error:
+                # Most likely a concurrent writer holding the lock; retried next interval
+                pass
+            self._stop.wait(interval)
+
+    def stop(self) -> None:
+        """Stops background compaction."""
+        self._stop.set()
+
+    def _page_counts(self) -> Tuple[int, int]:
+        with self._connect() as conn:
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return page_count, free_pages
+
+    def metrics(self) -> Dict[str, Any]:
+        """Database size, memory counts and lookup latency."""
+        with self._connect() as conn:
+            items, tasks = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT task_description) FROM long_term_memories"
+            ).fetchone()
+        page_count, free_pages = self._page_counts()
+        with self._lock:
+            latencies = list(self._lookup_latencies)
+            counters = {"deduplicated": self.deduplicated, "pruned": self.pruned}
+        return {
+            "db_path": self.db_path,
+            "db_size_bytes": os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0,
+            "free_pages": free_pages,
+            "page_count": page_count,
+            "items": items,
+            "tasks": tasks,
+            **counters,
+            "last_compaction": self.last_compaction,
+            "lookup_latency_seconds": LatencyStats.from_samples(latencies).model_dump(),
+        }
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Inspect or compact a crew long-term memory database.")
+    parser.add_argument("db_path", nargs="?", default="memory/audience_memory.db")
+    parser.add_argument("--compact", action="store_true", help="Apply retention and deduplication, then VACUUM.")
+    parser.add_argument("--max-age-days", type=float, default=RetentionPolicy().max_age_days)
+    parser.add_argument("--max-items", type=int, default=RetentionPolicy().max_items)
+    parser.add_argument("--min-score", type=float, default=None)
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db_path):
+        parser.exit(1, f"Error: no database at '{args.db_path}'\n")
+    policy = RetentionPolicy(max_age_days=args.max_age_days, max_items=args.max_items, min_score=args.min_score)
+    storage = BoundedLTMStorage(args.db_path, policy=policy, compaction_interval=0)
+    metrics = storage.compact(vacuum=True) if args.compact else storage.metrics()
+    print(json.dumps(metrics, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Index of previously generated agents, used as scaffolds for similar requests.
+
+Every package under generated_code/ is summarized (agent type, per-file docstrings and
+top-level definitions, graph validation status) into a small JSON index. A new
+``agent_type`` is matched against the index with TF-IDF similarity so the coder
+can start from the nearest validated package and only rewrite what differs.
+"""
+import ast
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from coder_ai.graph_loader import SKIPPED_DIRS
+
+INDEX_FILENAME = ".scaffold_index.json"
+
+# Words that say nothing about what an agent does
+STOPWORDS = {
+    "a", "an", "the", "for", "of", "to", "and", "or", "in", "on", "with", "any", "ai", "agent",
+    "agents", "bot", "that", "this", "my", "py", "src", "main", "init", "self", "state",
+}
+
+# Minimum similarity (0-1) for a package to be offered as a scaffold
+MIN_SIMILARITY = 0.2
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed and plural 's' stripped."""
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    return [word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+            for word in words if word not in STOPWORDS and len(word) > 1]
+
+
+def summarize_file(path: str) -> str:
+    """One-line summary of a source file: its docstring and top-level definitions."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read())
+    except (SyntaxError, UnicodeDecodeError, OSError):
+        return ""
+    docstring = (ast.get_docstring(tree) or "").strip().splitlines()
+    names = [node.name for node in tree.body
+             if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))]
+    parts = [docstring[0]] if docstring else []
+    if names:
+        parts.append(f"defines {', '.join(names)}")
+    return "; ".join(parts)
+
+
+class ScaffoldEntry(BaseModel):
+    """A previously generated package in the scaffold index."""
+
+    slug: str  # Directory name under generated_code/
+    agent_type: str
+    package_dir: str
+    files: Dict[str, str] = Field(default_factory=dict)  # Relative path -> summary
+    validated: bool = False  # Whether the graph passed topology validation
+    fingerprint: str = ""  # Changes whenever a file of the package changes
+    indexed_at: str = ""
+
+    def type_terms(self) -> List[str]:
+        """Tokens of the agent type the package was generated for."""
+        return tokenize(f"{self.agent_type} {self.slug.replace('_', ' ')}")
+
+    def terms(self) -> List[str]:
+        """Tokens describing the whole package, including its file summaries."""
+        return self.type_terms() + tokenize(" ".join(self.files.values()))
+
+
+def _package_files(package_dir: str) -> List[str]:
+    """Relative paths of the files of a package."""
+    paths = []
+    for root, dirs, files in os.walk(package_dir):
+        dirs[:] = sorted(d for d in dirs if d not in SKIPPED_DIRS and not d.startswith("."))
+        paths.extend(os.path.relpath(os.path.join(root, file), package_dir) for file in sorted(files))
+    return paths
+
+
+def _fingerprint(package_dir: str, paths: List[str]) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        stat = os.stat(os.path.join(package_dir, path))
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+class ScaffoldIndex:
+    """JSON-backed index of the packages under the code output directory."""
+
+    def __init__(self, code_output_dir: str):
+        self.code_output_dir = code_output_dir
+        self.path = os.path.join(code_output_dir, INDEX_FILENAME)
+        self.entries: Dict[str, ScaffoldEntry] = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self.entries = {slug: ScaffoldEntry.model_validate(entry) for slug, entry in json.load(f).items()}
+            except (json.JSONDecodeError, ValueError):
+                self.entries = {}
+
+    def save(self) -> None:
+        os.makedirs(self.code_output_dir, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({slug: entry.model_dump() for slug, entry in self.entries.items()}, f, indent=2)
+
+    def add(self, package_dir: str, agent_type: Optional[str] = None, validated: Optional[bool] = None) -> Optional[ScaffoldEntry]:
+        """Indexes or re-indexes one package.
+
+        Args:
+            package_dir: Root directory of the generated package
+            agent_type: Agent type the package was generated for; defaults to the known or slug-derived one
+            validated: Known validation status; the graph is validated when omitted
+
+        Returns:
+            The index entry, or None if the directory holds no Python code
+        """
+        slug = os.path.basename(os.path.normpath(package_dir))
+        paths = _package_files(package_dir)
+        if not any(path.endswith(".py") for path in paths):
+            self.entries.pop(slug, None)
+            return None
+
+        previous = self.entries.get(slug)
+        if validated is None:
+            validated = self._validate(package_dir)
+        entry = ScaffoldEntry(
+            slug=slug,
+            agent_type=agent_type or (previous.agent_type if previous else slug.replace("_", " ")),
+            package_dir=os.path.abspath(package_dir),
+            files={path: summarize_file(os.path.join(package_dir, path)) if path.endswith(".py") else ""
+                   for path in paths},
+            validated=validated,
+            fingerprint=_fingerprint(package_dir, paths),
+            indexed_at=datetime.now().isoformat(),
+        )
+        self.entries[slug] = entry
+        return entry
+
+    @staticmethod
+    def _validate(package_dir: str) -> bool:
+        # Imported here: validation pulls in crewai and the package's own dependencies
+        try:
+            from coder_ai.tools.graph_validator_tool import validate_package
+            return validate_package(package_dir).ok
+        except Exception:
+            return False
+
+    def refresh(self) -> None:
+        """Indexes new or changed packages and drops deleted ones, then saves the index."""
+        if not os.path.isdir(self.code_output_dir):
+            return
+        slugs = set()
+        for name in sorted(os.listdir(self.code_output_dir)):
+            package_dir = os.path.join(self.code_output_dir, name)
+            if name.startswith(".") or not os.path.isdir(package_dir):
+                continue
+            slugs.add(name)
+            entry = self.entries.get(name)
+            paths = _package_files(package_dir)
+            if entry is None or entry.fingerprint != _fingerprint(package_dir, paths):
+                self.add(package_dir)
+        for slug in set(self.entries) - slugs:
+            del self.entries[slug]
+        self.save()
+
+    def nearest(self, agent_type: str, validated_only: bool = True,
+                min_similarity: float = MIN_SIMILARITY) -> Optional[Tuple[ScaffoldEntry, float]]:
+        """Finds the indexed package most similar to the requested agent type.
+
+        Returns:
+            The entry and its similarity between 0 and 1, or None if nothing is similar enough
+        """
+        candidates = [entry for entry in self.entries.values() if entry.validated or not validated_only]
+        query = tokenize(agent_type)
+        if not candidates or not query:
+            return None
+
+        documents = [Counter(entry.terms()) for entry in candidates]
+        document_frequency = Counter(term for document in documents for term in document)
+        total = len(documents)
+
+        def idf(term: str) -> float:
+            return 1.0 + math.log((1 + total) / (1 + document_frequency[term]))
+
+        def vector(terms: List[str]) -> Dict[str, float]:
+            return {term: count * idf(term) for term, count in Counter(terms).items()}
+
+        def cosine(left: Dict[str, float], right: Dict[str, float]) -> float:
+            dot = sum(weight * right.get(term, 0.0) for term, weight in left.items())
+            norm = math.sqrt(sum(w * w for w in left.values())) * math.sqrt(sum(w * w for w in right.values()))
+            return dot / norm if norm else 0.0
+
+        query_vector = vector(query)
+        query_weight = sum(query_vector.values())
+
+        def similarity(entry: ScaffoldEntry, document: Counter) -> float:
+            # Half how close the agent types are, half how much of the request the package covers
+            coverage = sum(weight for term, weight in query_vector.items() if term in document) / query_weight
+            return 0.5 * cosine(query_vector, vector(entry.type_terms())) + 0.5 * coverage
+
+        best = max(
+            ((entry, similarity(entry, document)) for entry, document in zip(candidates, documents)),
+            key=lambda match: match[1],
+        )
+        return best if best[1] >= min_similarity else None
+
+    @staticmethod
+    def describe(entry: ScaffoldEntry, similarity: float, output_dir: Optional[str] = None) -> str:
+        """Prompt text telling the coder how to reuse a scaffold written to ``output_dir``."""
+        files = "\n".join(f"    - {path}" + (f": {summary}" if summary else "") for path, summary in entry.files.items())
+        if output_dir and os.path.realpath(output_dir) == os.path.realpath(entry.package_dir):
+            # Regenerating the same agent type: the scaffold is the output directory itself
+            return (
+                f"A previously generated and validated package for this agent type already exists at "
+                f"{entry.package_dir}\n"
+                f"  Files:\n{files}\n"
+                f"  Update it instead of writing from scratch: read the files you need, then call "
+                f"package_writer with keep_existing=true and only the files that must change."
+            )
+        return (
+            f"A previously generated and validated agent is similar to this request "
+            f"(similarity {similarity:.2f}): '{entry.agent_type}' at {entry.package_dir}\n"
+            f"  Files:\n{files}\n"
+            f"  Start from this scaffold instead of writing from scratch: read the files you need, then "
+            f"call package_writer with base_dir={entry.package_dir} and only the files that must change "
+            f"for the new agent type. Unchanged files are copied from the scaffold."
+        )
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+"""Local scoring of generated LangGraph packages.
+
+Used to pick the best of several code generation candidates without spending LLM
+calls: each candidate is checked for compiling sources, an importable graph factory,
+a graph that compiles and passes topology validation, and a smoke run against a
+stubbed LLM. Candidates are scored in separate processes so a hanging or crashing
+candidate cannot take the flow down with it.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from pydantic import BaseModel, Field
+
+from coder_ai.graph_loader import SKIPPED_DIRS, compile_graph, load_graph_factory, package_on_path
+
+# Points awarded per passed check; later checks depend on the earlier ones passing
+CHECK_POINTS = {
+    "has_docs": 1,  # README.md and requirements.txt are present
+    "compiles": 1,  # every Python file compiles
+    "imports": 2,  # the graph factory imports and builds a graph
+    "graph_compiles": 2,  # the StateGraph compiles
+    "graph_valid": 2,  # no topology errors from the graph validator
+    "smoke_passed": 3,  # one run completes without errors
+}
+
+# Checks a candidate must pass before it may replace the agent code directory
+REQUIRED_CHECKS = ("compiles", "imports")
+
+
+class CandidateScore(BaseModel):
+    """Local quality score of one generated package."""
+
+    package_dir: str
+    checks: Dict[str, bool] = Field(default_factory=lambda: {check: False for check in CHECK_POINTS})
+    errors: List[str] = Field(default_factory=list)
+    size: int = 0  # Bytes of Python source
+
+    @property
+    def points(self) -> int:
+        return sum(CHECK_POINTS[check] for check, passed in self.checks.items() if passed)
+
+    @property
+    def installable(self) -> bool:
+        """Whether the package passes every check in REQUIRED_CHECKS."""
+        return all(self.checks[check] for check in REQUIRED_CHECKS)
+
+    def rank_key(self) -> Tuple[int, int, int]:
+        """Sort key: most points, then fewest errors, then the smallest implementation."""
+        return (self.points, -len(self.errors), -self.size)
+
+
+def score_candidate(package_dir: str, smoke_runs: int = 1) -> CandidateScore:
+    """Scores a generated package in the current process.
+
+    Args:
+        package_dir: Root directory of the generated package
+        smoke_runs: Number of smoke runs to execute
+
+    Returns:
+        The candidate's score
+    """
+    # Imported here: the validator pulls in crewai, which is only needed once a package is scored
+    from coder_ai.loadtest import run_load_test
+    from coder_ai.tools.graph_validator_tool import validate_package
+
+    score = CandidateScore(package_dir=package_dir)
+    if not os.path.isdir(package_dir):
+        score.errors.append("Package directory does not exist")
+        return score
+
+    score.checks["has_docs"] = all(
+        os.path.exists(os.path.join(package_dir, name)) for name in ("README.md", "requirements.txt")
+    )
+
+    compiles = True
+    for root, dirs, files in os.walk(package_dir):
+        dirs[:] = [d for d in dirs if d not in SKIPPED_DIRS]
+        for file in files:
+            if not file.endswith(".py"):
+                continue
+            path = os.path.join(root, file)
+            with open(path, "rb") as f:
+                source = f.read()
+            score.size += len(source)
+            try:
+                compile(source, path, "exec")
+            except SyntaxError as e:
+                compiles = False
+                score.errors.append(f"{os.path.relpath(path, package_dir)}:{e.lineno}: {e.msg}")
+    score.checks["compiles"] = compiles and score.size > 0
+    if not score.checks["compiles"]:
+        return score
+
+    with package_on_path(package_dir):
+        try:
+            factory, _ = load_graph_factory(package_dir)
+            score.checks["imports"] = True
+            compile_graph(factory)
+            score.checks["graph_compiles"] = True
+        except Exception as e:
+            score.errors.append(f"{type(e).__name__}: {e}")
+            return score
+
+    report = validate_package(package_dir)
+    score.checks["graph_valid"] = report.ok
+    score.errors.extend(report.errors)
+
+    try:
+        smoke = run_load_test(package_dir, runs=smoke_runs, concurrency=1)
+        score.checks["smoke_passed"] = smoke.errors == 0
+        score.errors.extend(f"smoke run: {sample}" for sample in smoke.error_samples)
+    except Exception as e:
+        score.errors.append(f"smoke run: {type(e).__name__}: {e}")
+    return score
+
+
+def _score_in_subprocess(package_dir: str, timeout: float) -> CandidateScore:
+    """Scores a package in a separate interpreter, bounded by a timeout."""
+    env = dict(os.environ)
+    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src_dir, env.get("PYTHONPATH")]))
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-m", "coder_ai.scoring", package_dir],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            env=env,
+        )
+        return CandidateScore.model_validate(json.loads(completed.stdout)[0])
+    except subprocess.TimeoutExpired:
+        error = f"Scoring timed out after {timeout:.0f}s"
+    except (json.JSONDecodeError, IndexError, ValueError):
+        error = f"Scoring crashed: {completed.stderr.strip()[-500:]}"
+    return CandidateScore(package_dir=package_dir, errors=[error])
+
+
+def score_candidates(package_dirs: List[str], timeout: float = 120.0) -> List[CandidateScore]:
+    """Scores several packages concurrently, each in its own process.
+
+    Args:
+        package_dirs: Root directories of the candidate packages
+        timeout: Seconds allowed per candidate
+
+    Returns:
+        The scores, best candidate first
+    """
+    if not package_dirs:
+        return []
+    with ThreadPoolExecutor(max_workers=len(package_dirs)) as executor:
+        scores = list(executor.map(lambda path: _score_in_subprocess(path, timeout), package_dirs))
+    return sorted(scores, key=CandidateScore.rank_key, reverse=True)
+
+
+def main() -> None:
+    """Command-line entry point: prints the scores of the given packages as JSON."""
+    parser = argparse.ArgumentParser(description="Score generated LangGraph packages locally.")
+    parser.add_argument("packages", nargs="+", help="Package directories to score.")
+    args = parser.parse_args()
+
+    # Generated agents log and print while running; keep stdout for the JSON result
+    logging.disable(logging.CRITICAL)
+    with contextlib.redirect_stdout(sys.stderr):
+        scores = [score_candidate(os.path.abspath(package)).model_dump() for package in args.packages]
+    print(json.dumps(scores))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python
+"""Warm HTTP service around any LangGraph agent under generated_code/.
+
+Running a generated agent as ``python main.py`` pays interpreter startup, the
+langchain/langgraph imports and graph compilation on every request. This runner
+imports and compiles the graph once and keeps it in memory, so a request only
+costs the graph work itself.
+
+Endpoints:
+    POST /invoke   JSON state in, final state out
+    POST /stream   JSON state in, one JSON line per node update (NDJSON, chunked)
+    GET  /health   Liveness and the graph being served
+    GET  /metrics  Request counts, errors and latency percentiles
+
+Example:
+    serve a_likendin_post_creator_for_any_topic --port 8000
+    curl -X POST localhost:8000/invoke -d '{"topic": "AI in Marketing"}'
+"""
+import argparse
+import contextlib
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, Iterator, Optional
+
+from coder_ai.graph_loader import compile_graph, load_graph_factory, package_on_path
+from coder_ai.loadtest import argparse_defaults, build_initial_state, resolve_package_dir, stub_llms
+from coder_ai.metrics import LatencyStats
+
+DEFAULT_PORT = 8000
+
+# Number of most recent requests the latency percentiles are computed over
+METRICS_WINDOW = 1000
+
+
+def to_jsonable(value: Any) -> Any:
+    """``json.dumps`` fallback for state values such as messages and Pydantic models."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if hasattr(value, "dict"):
+        return value.dict()
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    return str(value)
+
+
+class GraphService:
+    """A generated graph, compiled once and kept warm for repeated runs.
+
+    Args:
+        package_dir: Root directory of the generated package
+        factory: Optional 'module:function' reference of the graph factory
+        use_defaults: Fill inputs missing from a request with the argparse defaults of main.py
+        recursion_limit: LangGraph recursion limit per run
+        stub_llm: Replace LLM calls with canned responses, for trying the service offline
+    """
+
+    def __init__(self, package_dir: str, factory: Optional[str] = None, use_defaults: bool = True,
+                 recursion_limit: int = 50, stub_llm: bool = False):
+        started = time.perf_counter()
+        self.package_dir = resolve_package_dir(package_dir)
+        self.recursion_limit = recursion_limit
+        # The package stays importable for the lifetime of the service; nodes may import lazily
+        self._context = contextlib.ExitStack()
+        self._context.enter_context(package_on_path(self.package_dir))
+        if stub_llm:
+            self._context.enter_context(stub_llms())
+        graph_factory, self.factory = load_graph_factory(self.package_dir, factory)
+        self.app = compile_graph(graph_factory)
+        defaults = argparse_defaults(os.path.join(self.package_dir, "main.py")) if use_defaults else {}
+        self._base_state = build_initial_state(self.app, defaults)
+        # Fields of the state schema; empty when the graph declares none
+        self._fields = set(build_initial_state(self.app, {}))
+        self.startup_seconds = time.perf_counter() - started
+        self.started_at = time.time()
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self._latencies: Deque[float] = deque(maxlen=METRICS_WINDOW)
+        self._first_chunk_latencies: Deque[float] = deque(maxlen=METRICS_WINDOW)
+
+    def close(self) -> None:
+        self._context.close()
+
+    def initial_state(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """The complete initial state for a request: defaults overridden by the given inputs."""
+        state = copy.deepcopy(self._base_state)
+        state.update({key: value for key, value in inputs.items() if not self._fields or key in self._fields})
+        return state
+
+    def _config(self) -> Dict[str, Any]:
+        return {"recursion_limit": self.recursion_limit}
+
+    @contextlib.contextmanager
+    def _measure(self) -> Iterator[None]:
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except Exception:
+            failed = True
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self._latencies.append(time.perf_counter() - started)
+                if failed:
+                    self.errors += 1
+
+    def invoke(self, inputs: Dict[str, Any]) -> Any:
+        """Runs the graph to completion and returns the final state."""
+        with self._measure():
+            return self.app.invoke(self.initial_state(inputs), config=self._config())
+
+    def stream(self, inputs: Dict[str, Any], stream_mode: str = "updates") -> Iterator[Any]:
+        """Runs the graph and yields its stream chunks as they are produced."""
+        with self._measure():
+            started = time.perf_counter()
+            first = True
+            for chunk in self.app.stream(self.initial_state(inputs), config=self._config(), stream_mode=stream_mode):
+                if first:
+                    first = False
+                    with self._lock:
+                        self._first_chunk_latencies.append(time.perf_counter() - started)
+                yield chunk
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "status": "ok",
+            "package_dir": self.package_dir,
+            "factory": self.factory,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = list(self._latencies)
+            first_chunk = list(self._first_chunk_latencies)
+            counts = {"requests": self.requests, "errors": self.errors, "in_flight": self.in_flight}
+        return {
+            **counts,
+            "error_rate": counts["errors"] / counts["requests"] if counts["requests"] else 0.0,
+            "startup_seconds": round(self.startup_seconds, 3),
+            "latency_seconds": LatencyStats.from_samples(latencies).model_dump(),
+            "stream_first_chunk_seconds": LatencyStats.from_samples(first_chunk).model_dump(),
+        }
+
+
+class GraphRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end of a GraphService."""
+
+    service: GraphService = None  # Set per server by serve_graph()
+    protocol_version = "HTTP/1.1"
+
+    def _send(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload, default=to_jsonable).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_chunk(self, payload: Any) -> None:
+        data = (json.dumps(payload, default=to_jsonable) + "\n").encode("utf-8")
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _read_body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(body, dict):
+            raise ValueError("Body must be a JSON object")
+        return body
+
+    def do_GET(self) -> None:
+        if self.path == "/health":
+            self._send(200, self.service.health())
+        elif self.path == "/metrics":
+            self._send(200, self.service.metrics())
+        else:
+            self._send(404, {"error": f"Unknown path '{self.path}'"})
+
+    def do_POST(self) -> None:
+        if self.path not in ("/invoke", "/stream"):
+            # The body is not read, so the connection is closed rather than have it parsed as the next request
+            self.close_connection = True
+            self._send(404, {"error": f"Unknown path '{self.path}'"})
+            return
+        try:
+            body = self._read_body()
+        except ValueError as e:
+            # Possibly an invalid Content-Length, in which case the body is still unread
+            self.close_connection = True
+            self._send(400, {"error": str(e)})
+            return
+        # Either {"state": {...}, "stream_mode": ...} or the state itself
+        inputs = body["state"] if isinstance(body.get("state"), dict) else body
+        started = time.perf_counter()
+
+        if self.path == "/invoke":
+            try:
+                state = self.service.invoke(inputs)
+            except Exception as e:
+                self._send(500, {"error": f"{type(e).__name__}: {e}"})
+                return
+            self._send(200, {"state": state, "latency_seconds": round(time.perf_counter() - started, 4)})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for chunk in self.service.stream(inputs, body.get("stream_mode", "updates")):
+                self._write_chunk(chunk)
+            self._write_chunk({"done": True, "latency_seconds": round(time.perf_counter() - started, 4)})
+        except (BrokenPipeError, ConnectionResetError):
+            return
+        except Exception as e:
+            # Headers are already sent, so the error is reported in the stream
+            self._write_chunk({"done": True, "error": f"{type(e).__name__}: {e}"})
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, format, *args) -> None:
+        # Latency is reported by /metrics; per-request access logs only slow the hot path
+        pass
+
+
+def serve_graph(service: GraphService, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                background: bool = False) -> ThreadingHTTPServer:
+    """Serves a GraphService over HTTP, blocking unless ``background`` is set.
+
+    Returns:
+        The server; call ``shutdown()`` to stop a background server
+    """
+    handler = type("BoundGraphRequestHandler", (GraphRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    if background:
+        threading.Thread(target=server.serve_forever, name="graph-service", daemon=True).start()
+    else:
+        server.serve_forever()
+    return server
+
+
+def main() -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Serve a generated LangGraph agent over HTTP with a warm graph.")
+    parser.add_argument("package", help="Package directory, or the name of a directory under generated_code/.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--factory", help="Graph factory as 'module:function'. Discovered if omitted.")
+    parser.add_argument("--no-defaults", action="store_true",
+                        help="Do not fill missing inputs with the argparse defaults of main.py.")
+    parser.add_argument("--recursion-limit", type=int, default=50)
+    parser.add_argument("--stub-llm", action="store_true", help="Replace LLM calls with canned responses.")
+    parser.add_argument("--verbose", action="store_true", help="Keep the generated agent's INFO logs.")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # Generated agents log every node; failures are still reported in the responses
+        logging.disable(logging.INFO)
+
+    service = GraphService(args.package, factory=args.factory, use_defaults=not args.no_defaults,
+                           recursion_limit=args.recursion_limit, stub_llm=args.stub_llm)
+    print(f"Serving {service.factory} from {service.package_dir} on http://{args.host}:{args.port} "
+          f"(started in {service.startup_seconds:.2f}s)")
+    try:
+        serve_graph(service, args.host, args.port)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Type
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from coder_ai.tools.knowledge_store import KnowledgeStore
+
+# Searches currently in flight, keyed by cache key, shared by all tool instances
+_inflight: Dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+
+def normalize_query(query: str) -> str:
+    """Normalizes a search query so trivially different spellings share a cache entry."""
+    query = query.strip().strip("\"'").lower()
+    query = re.sub(r"\s+", " ", query)
+    return query.rstrip("?.! ")
+
+
+def _local_documents(knowledge_dir: str) -> Iterator[Tuple[str, str]]:
+    """Yields (name, markdown) for crawled markdown files and knowledge store documents."""
+    for root, _, files in os.walk(knowledge_dir):
+        if KnowledgeStore.exists(root):
+            with KnowledgeStore(root) as store:
+                for doc_id, _, markdown in store.iter_documents():
+                    yield doc_id, markdown
+        for file in files:
+            if not file.endswith(".md"):
+                continue
+            try:
+                with open(os.path.join(root, file), "r", encoding="utf-8") as f:
+                    yield os.path.join(root, file), f.read()
+            except (OSError, UnicodeDecodeError):
+                continue
+
+
+def search_local_docs(query: str, knowledge_dir: str, limit: int = 5) -> List[Dict[str, str]]:
+    """Searches crawled documentation for the query terms.
+
+    Args:
+        query: Search query
+        knowledge_dir: Directory holding crawled markdown files or knowledge stores (searched recursively)
+        limit: Maximum number of results
+
+    Returns:
+        Results shaped like web search results: title, link and snippet
+    """
+    terms = [term for term in re.findall(r"[a-z0-9_]+", query.lower()) if len(term) > 2]
+    if not terms or not os.path.isdir(knowledge_dir):
+        return []
+
+    scored = []
+    for path, content in _local_documents(knowledge_dir):
+        lowered = content.lower()
+        hits = {term: lowered.count(term) for term in terms}
+        matched = sum(1 for count in hits.values() if count)
+        if not matched:
+            continue
+        # Documents matching more distinct terms win; frequency breaks ties
+        scored.append((matched, sum(hits.values()), path, content, lowered))
+
+    results = []
+    for _, _, path, content, lowered in sorted(scored, key=lambda item: item[:2], reverse=True)[:limit]:
+        first_line = content.splitlines()[0] if content else ""
+        source = first_line[len("# Source: "):] if first_line.startswith("# Source: ") else path
+        position = min((lowered.find(term) for term in terms if term in lowered), default=0)
+        start = max(0, position - 150)
+        snippet = re.sub(r"\s+", " ", content[start:position + 350]).strip()
+        results.append({"title": os.path.basename(path), "link": source, "snippet": snippet})
+    return results
+
+
+class CachedSearchInput(BaseModel):
+    """Input schema for CachedSearchTool."""
+
+    search_query: str = Field(
+        ...,
+        description="Mandatory search query you want to use to search the internet",
+    )
+
+
+class CachedSearchTool(BaseTool):
+    name: str = "search_the_internet"
+    description: str = (
+        "Searches the internet for a query and returns the results. Results are cached, so "
+        "repeating a query is free. Falls back to the locally crawled LangGraph documentation "
+        "when the web search is unavailable."
+    )
+    args_schema: Type[BaseModel] = CachedSearchInput
+
+    search_tool: Any = Field(None, description="Web search tool to wrap, e.g. SerperDevTool.")
+    cache_dir: str = Field(".cache/search", description="Directory for cached search results.")
+    ttl_seconds: int = Field(7 * 24 * 3600, description="Seconds a cached result stays fresh.")
+    max_age_seconds: int = Field(
+        30 * 24 * 3600,
+        description="Seconds a cached result is kept as a fallback for failed searches; older entries are deleted.",
+    )
+    wait_timeout: float = Field(
+        60.0,
+        description="Seconds to wait for an identical search in flight before searching independently.",
+    )
+    knowledge_dir: str = Field("knowledge", description="Crawled documentation used as the offline fallback.")
+    offline: bool = Field(
+        default_factory=lambda: os.environ.get("SEARCH_OFFLINE", "").lower() in ("1", "true", "yes"),
+        description="Never call the web search; answer from the cache and local documentation only.",
+    )
+
+    def _cache_key(self, query: str) -> str:
+        """Cache key of a query: the normalized query and the settings of the wrapped search tool.
+
+        Wrappers around differently configured tools (e.g. another ``n_results`` or
+        ``search_url``) get different results for the same query, so they must not share entries.
+        """
+        settings = {}
+        if self.search_tool is not None:
+            settings = {
+                name: value for name, value in sorted(vars(self.search_tool).items())
+                if name not in ("name", "description") and isinstance(value, (str, int, float, bool, type(None)))
+            }
+            settings["type"] = type(self.search_tool).__name__
+        return json.dumps([normalize_query(query), settings], sort_keys=True)
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.json")
+
+    def _read_cache(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._cache_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_cache(self, key: str, query: str, result: Any) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._cache_path(key)
+        entry = {"query": query, "key": key, "created_at": time.time(), "result": result}
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, default=str)
+        os.replace(temp_path, path)
+        self._prune_cache()
+
+    def _prune_cache(self) -> None:
+        """Deletes cache entries older than ``max_age_seconds``, judged by file modification time."""
+        cutoff = time.time() - self.max_age_seconds
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                # Removed concurrently by another instance
+                continue
+
+    def _fallback(self, query: str, cached: Optional[Dict[str, Any]], reason: str) -> Any:
+        """Answers from a stale cache entry or, failing that, the local documentation."""
+        if cached is not None:
+            return cached["result"]
+        results = search_local_docs(query, self.knowledge_dir)
+        if not results:
+            return f"No search results for '{query}' ({reason}) and nothing matched in the local documentation."
+        return {"searchParameters": {"q": query, "source": "local documentation"}, "organic": results}
+
+    def _search(self, query: str, key: str) -> Any:
+        cached = self._read_cache(key)
+        if cached is not None and time.time() - cached.get("created_at", 0) < self.ttl_seconds:
+            return cached["result"]
+        if self.offline or self.search_tool is None:
+            return self._fallback(query, cached, "offline")
+        try:
+            result = self.search_tool.run(search_query=query)
+        except Exception as e:
+            return self._fallback(query, cached, f"web search failed: {e}")
+        if isinstance(result, str) and result.startswith("Error"):
+            return self._fallback(query, cached, result)
+        self._write_cache(key, query, result)
+        return result
+
+    def _run(self, search_query: str) -> Any:
+        """Search with caching and request coalescing.
+
+        Args:
+            search_query: The search query
+
+        Returns:
+            The web search results, from the cache when fresh
+        """
+        key = self._cache_key(search_query)
+        with _inflight_lock:
+            future = _inflight.get(key)
+            owner = future is None
+            if owner:
+                future = _inflight[key] = Future()
+        if not owner:
+            # An identical query is already being searched; share its result
+            try:
+                return future.result(timeout=self.wait_timeout)
+            except FutureTimeoutError:
+                # The search in flight is hanging; do not wait for it any longer
+                try:
+                    return self._search(search_query, key)
+                except Exception as e:
+                    return f"Error during search: {str(e)}"
+
+        try:
+            result = self._search(search_query, key)
+        except Exception as e:
+            result = f"Error during search: {str(e)}"
+        finally:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+        future.set_result(result)
+        return result
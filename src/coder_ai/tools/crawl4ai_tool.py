@@ -31,6 +31,24 @@ class DocumentationCrawlerInput(BaseModel):
         True,
         description="Whether to optimize the markdown for LLM processing.",
     )
+    converter: str = Field(
+        "crawl4ai",
+        description=(
+            "Markdown conversion: 'crawl4ai' converts inside the crawler, 'docling' converts the raw HTML "
+            "in a pool of worker processes, preserving tables and code blocks."
+        ),
+    )
+    conversion_workers: int = Field(
+        0,
+        description="Number of worker processes for 'docling' conversion. 0 uses all available cores, at most one per URL.",
+    )
+    storage: str = Field(
+        "files",
+        description=(
+            "How to store the documents: 'files' writes a markdown and a metadata file per page, 'pack' "
+            "appends them to a single compressed knowledge store (knowledge.pack + knowledge.idx)."
+        ),
+    )
 
 
 class DocumentationCrawlerTool(BaseTool):
@@ -43,6 +61,46 @@ class DocumentationCrawlerTool(BaseTool):
     )
     args_schema: Type[BaseModel] = DocumentationCrawlerInput
 
+    @staticmethod
+    async def _crawl_and_convert(crawler, urls, concurrency, pool, fit_for_llm):
+        """Fetch pages and hand each one to the conversion pool as soon as it arrives.
+        
+        Conversion runs in worker processes, so the event loop only does network I/O and a
+        freed fetch slot can start the next download while earlier pages are still converting.
+        
+        Returns:
+            (crawl result, converted markdown or None) per URL, in input order, and the error
+            that broke the conversion pool, if any
+        """
+        import asyncio
+        from concurrent.futures.process import BrokenProcessPool
+        from coder_ai.tools.html_converter import html_to_markdown, image_references
+        
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        pool_errors = []
+        
+        async def fetch_and_convert(url):
+            async with semaphore:
+                result = await crawler.arun(url)
+            if not result.success or not getattr(result, "html", None) or pool_errors:
+                return result, None
+            try:
+                markdown = await loop.run_in_executor(pool, html_to_markdown, result.html, fit_for_llm)
+            except BrokenProcessPool as e:
+                # Every later page would fail the same way; remaining pages use the crawler's markdown
+                pool_errors.append(str(e) or "a conversion worker died")
+                return result, None
+            except Exception:
+                # Fall back to the crawler's markdown for pages docling cannot convert
+                return result, None
+            # docling drops image sources; keep the ones the crawler found
+            images = (getattr(result, "media", None) or {}).get("images", [])
+            return result, markdown + image_references(images, result.url)
+        
+        results = await asyncio.gather(*(fetch_and_convert(url) for url in urls))
+        return results, (pool_errors[0] if pool_errors else None)
+
     def _run(
         self,
         urls: List[str],
@@ -51,6 +109,9 @@ class DocumentationCrawlerTool(BaseTool):
         concurrency: int = 5,
         cache_mode: str = "disk",
         fit_for_llm: bool = True,
+        converter: str = "crawl4ai",
+        conversion_workers: int = 0,
+        storage: str = "files",
     ) -> str:
         """Execute the documentation crawling and processing.
         
@@ -61,6 +122,9 @@ class DocumentationCrawlerTool(BaseTool):
             concurrency: Number of concurrent requests to make during crawling
             cache_mode: Caching mode to use ('memory', 'disk', or 'none')
             fit_for_llm: Whether to optimize the markdown for LLM processing
+            converter: 'crawl4ai' or 'docling' markdown conversion
+            conversion_workers: Worker processes for docling conversion (0 = all cores, at most one per URL)
+            storage: 'files' (markdown file per page) or 'pack' (single compressed store)
             
         Returns:
             A summary of the crawling and processing results
@@ -69,6 +133,7 @@ class DocumentationCrawlerTool(BaseTool):
             # Import Crawl4AI here to avoid dependency requirements for those not using this tool
             from crawl4ai import AsyncWebCrawler
             import asyncio
+            import contextlib
             import os
             import json
             from datetime import datetime
@@ -85,63 +150,96 @@ class DocumentationCrawlerTool(BaseTool):
             )
             
             # Run the crawler asynchronously
-            results = asyncio.run(crawler.arun_many(urls))
+            conversion_error = None
+            if converter == "docling":
+                from coder_ai.tools.html_converter import create_conversion_pool, docling_available
+                # docling is only imported inside the workers, so check for it before starting them
+                if not docling_available():
+                    return "Error: docling is not installed. Please install it with 'pip install docling' or use converter='crawl4ai'."
+                with create_conversion_pool(conversion_workers or None, max_pages=len(urls)) as pool:
+                    results, conversion_error = asyncio.run(
+                        self._crawl_and_convert(crawler, urls, concurrency, pool, fit_for_llm)
+                    )
+            else:
+                results = [(result, None) for result in asyncio.run(crawler.arun_many(urls))]
             
             # Process and save the results
-            processed_files = []
-            summary = {
-                "total_urls": len(urls),
-                "successful": 0,
-                "failed": 0,
-                "processed_files": []
-            }
-            
-            for i, result in enumerate(results):
-                if result.success:
-                    # Generate a filename from the URL
-                    filename = f"doc_{i+1}.md"
-                    filepath = os.path.join(output_dir, filename)
-                    
-                    # Get markdown content
-                    markdown_content = result.get_markdown(fit_for_llm=fit_for_llm)
-                    
-                    # Add URL reference at the top of the markdown
-                    markdown_content = f"# Source: {result.url}\n\n{markdown_content}"
-                    
-                    # Save the markdown file
-                    with open(filepath, "w", encoding="utf-8") as f:
-                        f.write(markdown_content)
-                    
-                    # Save metadata file
-                    metadata_path = os.path.join(output_dir, f"doc_{i+1}_metadata.json")
-                    metadata = {
-                        "url": result.url,
-                        "title": result.title or "Unknown",
-                        "crawl_time": datetime.now().isoformat(),
-                        "status_code": result.status_code,
-                    }
-                    
-                    with open(metadata_path, "w", encoding="utf-8") as f:
-                        json.dump(metadata, f, indent=2)
-                    
-                    processed_files.append(filepath)
-                    summary["successful"] += 1
-                    summary["processed_files"].append({
-                        "url": result.url,
-                        "file": filepath
-                    })
-                else:
-                    summary["failed"] += 1
-            
-            # Generate and save the summary
-            summary_path = os.path.join(output_dir, "crawl_summary.json")
-            with open(summary_path, "w", encoding="utf-8") as f:
-                json.dump(summary, f, indent=2)
-            
-            # Return a human-readable summary
-            return f"Crawling complete. Successfully processed {summary['successful']} out of {len(urls)} URLs. " \
-                   f"Created {len(processed_files)} markdown files in '{output_dir}'."
-                   
+            with contextlib.ExitStack() as stack:
+                processed_files = []
+                store = None
+                if storage == "pack":
+                    from coder_ai.tools.knowledge_store import KnowledgeStore
+                    # Closed on every path, including errors part-way through the results
+                    store = stack.enter_context(KnowledgeStore(output_dir))
+                summary = {
+                    "total_urls": len(urls),
+                    "successful": 0,
+                    "failed": 0,
+                    "conversion_error": conversion_error,
+                    "processed_files": []
+                }
+                
+                for i, (result, converted_markdown) in enumerate(results):
+                    if result.success:
+                        # Generate a filename from the URL
+                        filename = f"doc_{i+1}.md"
+                        filepath = os.path.join(output_dir, filename)
+                        
+                        # Get markdown content, falling back to the crawler's own conversion
+                        markdown_content = converted_markdown or result.get_markdown(fit_for_llm=fit_for_llm)
+                        
+                        # Add URL reference at the top of the markdown
+                        markdown_content = f"# Source: {result.url}\n\n{markdown_content}"
+                        
+                        metadata = {
+                            "url": result.url,
+                            "title": result.title or "Unknown",
+                            "crawl_time": datetime.now().isoformat(),
+                            "status_code": result.status_code,
+                            "converter": converter if converted_markdown else "crawl4ai",
+                        }
+                        
+                        if store is not None:
+                            # Append to the knowledge store; files are addressed as index#doc id,
+                            # since compaction moves the chunks to a new pack file
+                            doc_id = store.append(result.url, markdown_content, metadata["title"], metadata)
+                            filepath = f"{store.index_path}#{doc_id}"
+                        else:
+                            # Save the markdown file
+                            with open(filepath, "w", encoding="utf-8") as f:
+                                f.write(markdown_content)
+                            
+                            # Save metadata file
+                            metadata_path = os.path.join(output_dir, f"doc_{i+1}_metadata.json")
+                            with open(metadata_path, "w", encoding="utf-8") as f:
+                                json.dump(metadata, f, indent=2)
+                        
+                        processed_files.append(filepath)
+                        summary["successful"] += 1
+                        summary["processed_files"].append({
+                            "url": result.url,
+                            "file": filepath
+                        })
+                    else:
+                        summary["failed"] += 1
+                
+                # Generate and save the summary
+                summary_path = os.path.join(output_dir, "crawl_summary.json")
+                with open(summary_path, "w", encoding="utf-8") as f:
+                    json.dump(summary, f, indent=2)
+                
+                # Return a human-readable summary
+                note = ""
+                if conversion_error:
+                    note = f" Docling conversion failed ({conversion_error}); the affected pages use crawl4ai's markdown."
+                if store is not None:
+                    # Re-crawled pages superseded their previous versions; drop those from the pack
+                    store.compact()
+                    return f"Crawling complete. Successfully processed {summary['successful']} out of {len(urls)} URLs. " \
+                           f"Stored {len(processed_files)} documents in the knowledge store in '{output_dir}'.{note}"
+                return f"Crawling complete. Successfully processed {summary['successful']} out of {len(urls)} URLs. " \
+                       f"Created {len(processed_files)} markdown files in '{output_dir}'.{note}"
+                       
         except ImportError:
             return "Error: Crawl4AI is not installed. Please install it with 'pip install crawl4ai'."
         except Exception as e:
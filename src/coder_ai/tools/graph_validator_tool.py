@@ -0,0 +1,367 @@
+import ast
+import difflib
+import inspect
+import textwrap
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+from coder_ai.graph_loader import build_graph, load_graph_factory, package_on_path
+
+START = "__start__"
+END = "__end__"
+
+
+class GraphValidationReport(BaseModel):
+    """Result of statically validating the topology of a generated graph."""
+
+    package_dir: str
+    factory: Optional[str] = None  # module:function that built the graph
+    nodes: List[str] = Field(default_factory=list)
+    errors: List[str] = Field(default_factory=list)
+    warnings: List[str] = Field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def format(self) -> str:
+        """Renders the report as plain text for agents and logs."""
+        status = "PASSED" if self.ok else "FAILED"
+        lines = [f"Graph validation {status} for {self.factory or self.package_dir}"]
+        if self.nodes:
+            lines.append(f"Nodes: {', '.join(self.nodes)}")
+        lines.extend(f"ERROR: {error}" for error in self.errors)
+        lines.extend(f"WARNING: {warning}" for warning in self.warnings)
+        return "\n".join(lines)
+
+
+def _underlying_function(runnable: Any) -> Optional[Callable]:
+    """Unwraps the Python function behind a node or branch runnable."""
+    for attribute in ("func", "afunc"):
+        func = getattr(runnable, attribute, None)
+        if callable(func):
+            return func
+    return runnable if inspect.isfunction(runnable) else None
+
+
+def _string_targets(node: ast.AST) -> Optional[List[str]]:
+    """Resolves the node names an expression may evaluate to, or None if it is dynamic."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, ast.Name) and node.id in ("END", "START"):
+        return [END if node.id == "END" else START]
+    if isinstance(node, ast.IfExp):
+        body, orelse = _string_targets(node.body), _string_targets(node.orelse)
+        return None if body is None or orelse is None else body + orelse
+    if isinstance(node, (ast.List, ast.Tuple)):
+        targets = []
+        for element in node.elts:
+            element_targets = _string_targets(element)
+            if element_targets is None:
+                return None
+            targets.extend(element_targets)
+        return targets
+    if isinstance(node, ast.ListComp):
+        return _string_targets(node.elt)
+    if isinstance(node, ast.Call):
+        func = node.func
+        name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+        if name == "Send" and node.args:
+            return _string_targets(node.args[0])
+        if name == "Command":
+            goto = next((kw.value for kw in node.keywords if kw.arg == "goto"), None)
+            return [] if goto is None else _string_targets(goto)
+    return None
+
+
+def _routing_targets(func: Callable) -> Tuple[Set[str], bool]:
+    """Statically collects the node names a routing or node function can route to.
+
+    Returns:
+        The literal targets found in ``return`` statements and ``Send``/``Command`` calls,
+        and whether any return value could not be resolved statically
+    """
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+    except (OSError, TypeError, SyntaxError):
+        return set(), True
+
+    function = tree.body[0]
+    targets: Set[str] = set()
+    dynamic = False
+    # Walk the function body without descending into nested functions or lambdas
+    stack = list(getattr(function, "body", []))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.ClassDef)):
+            continue
+        if isinstance(node, ast.Return) and node.value is not None:
+            resolved = _string_targets(node.value)
+            if resolved is None:
+                dynamic = True
+            else:
+                targets.update(resolved)
+        elif isinstance(node, ast.Call):
+            name = node.func.id if isinstance(node.func, ast.Name) else getattr(node.func, "attr", None)
+            if name in ("Send", "Command"):
+                targets.update(_string_targets(node) or [])
+        stack.extend(ast.iter_child_nodes(node))
+    return targets, dynamic
+
+
+def _returns_routes(func: Callable) -> bool:
+    """Returns True if a node function returns Command objects, i.e. routes by itself."""
+    try:
+        source = inspect.getsource(func)
+    except (OSError, TypeError):
+        return False
+    return "Command(" in source
+
+
+def _strongly_connected(adjacency: Dict[str, Set[str]]) -> List[List[str]]:
+    """Tarjan's algorithm, iterative so deep graphs do not hit the recursion limit."""
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack: Set[str] = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+    counter = 0
+
+    for root in adjacency:
+        if root in index:
+            continue
+        work = [(root, iter(sorted(adjacency[root])))]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            child = next(children, None)
+            if child is not None:
+                if child not in adjacency:
+                    continue
+                if child not in index:
+                    index[child] = lowlink[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(sorted(adjacency[child]))))
+                elif child in on_stack:
+                    lowlink[node] = min(lowlink[node], index[child])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(sorted(component))
+    return components
+
+
+def validate_graph(graph: Any, report: GraphValidationReport) -> GraphValidationReport:
+    """Checks the topology of an uncompiled StateGraph and records problems on the report.
+
+    Checks that every edge and conditional-edge endpoint is a node, that the literal
+    values returned by routing functions line up with their path maps, that all nodes
+    are reachable from START and that every cycle has a conditional exit.
+    """
+    nodes = set(graph.nodes)
+    report.nodes = sorted(nodes)
+    known = nodes | {START, END}
+    adjacency: Dict[str, Set[str]] = {node: set() for node in nodes | {START}}
+    # Targets of routing functions and Commands, including END, per source node
+    conditional_targets: Dict[str, Set[str]] = {}
+    has_dynamic_routing = False
+
+    def add_edge(source: str, target: str, description: str, check_source: bool = True) -> None:
+        if check_source and source not in known:
+            report.errors.append(f"{description}: source '{source}' is not a node")
+        if target not in known:
+            report.errors.append(f"{description}: target '{target}' is not a node")
+        if source in adjacency and target in nodes:
+            adjacency[source].add(target)
+
+    def add_route(source: str, target: str, description: str) -> None:
+        # Unknown sources of conditional edges are reported once per branch below
+        conditional_targets.setdefault(source, set()).add(target)
+        add_edge(source, target, description, check_source=source in nodes or source == START)
+
+    for source, target in sorted(graph.edges):
+        add_edge(source, target, f"Edge '{source}' -> '{target}'")
+    for sources, target in sorted(getattr(graph, "waiting_edges", set())):
+        for source in sources:
+            add_edge(source, target, f"Edge {list(sources)} -> '{target}'")
+
+    all_path_keys = {key for branches in graph.branches.values() for branch in branches.values()
+                     for key in (getattr(branch, "ends", None) or {})}
+
+    for source, branches in sorted(graph.branches.items()):
+        for name, branch in branches.items():
+            description = f"Conditional edge '{name}' from '{source}'"
+            if source not in known:
+                report.errors.append(
+                    f"{description}: source '{source}' is not a node; add it with add_node() "
+                    f"or attach the routing function to an existing node"
+                )
+            func = _underlying_function(branch.path)
+            returned, dynamic = _routing_targets(func) if func else (set(), True)
+            if dynamic:
+                has_dynamic_routing = True
+                conditional_targets.setdefault(source, set()).add(END)
+                report.warnings.append(f"{description}: return values of '{name}' could not all be resolved statically")
+
+            ends = getattr(branch, "ends", None)
+            if not ends:
+                for value in sorted(returned):
+                    add_route(source, value, f"{description}: return value '{value}'")
+                continue
+
+            for key, target in sorted(ends.items()):
+                add_route(source, target, f"{description}: path map key '{key}'")
+            unmatched = sorted(value for value in returned - set(ends) if not _is_send_target(func, value))
+            for value in returned - set(ends) - set(unmatched):
+                add_route(source, value, f"{description}: Send to '{value}'")
+            if not dynamic:
+                for key in sorted(set(ends) - returned):
+                    hint = difflib.get_close_matches(key, unmatched, n=1)
+                    report.errors.append(
+                        f"{description}: path map key '{key}' is never returned by '{name}'"
+                        + (f"; did you mean '{hint[0]}'?" if hint else "")
+                    )
+            unknown = [value for value in unmatched if value not in known and value not in all_path_keys]
+            for value in unknown:
+                report.errors.append(f"{description}: '{name}' can return '{value}' which is neither a node nor a path map key")
+            shared = [value for value in unmatched if value not in unknown]
+            if shared:
+                report.warnings.append(
+                    f"{description}: '{name}' can also return {shared} which are not in the path map "
+                    f"{sorted(ends)}; reaching them from '{source}' raises at runtime"
+                )
+
+    for name, spec in sorted(graph.nodes.items()):
+        func = _underlying_function(getattr(spec, "runnable", None))
+        if func is None or not _returns_routes(func):
+            continue
+        targets, dynamic = _routing_targets(func)
+        if dynamic:
+            has_dynamic_routing = True
+            conditional_targets.setdefault(name, set()).add(END)
+        for target in sorted(targets):
+            add_route(name, target, f"Command from node '{name}'")
+
+    # Reachability from START
+    reachable: Set[str] = set()
+    frontier = [START]
+    while frontier:
+        node = frontier.pop()
+        for child in adjacency.get(node, ()):
+            if child not in reachable:
+                reachable.add(child)
+                frontier.append(child)
+    if not adjacency[START]:
+        report.errors.append("Graph has no entry point; add an edge from START or call set_entry_point()")
+    for node in sorted(nodes - reachable):
+        message = f"Node '{node}' is unreachable from START"
+        (report.warnings if has_dynamic_routing else report.errors).append(message)
+
+    # Cycles without any conditional exit run until the recursion limit
+    for component in _strongly_connected(adjacency):
+        if len(component) == 1 and component[0] not in adjacency[component[0]]:
+            continue
+        members = set(component)
+        exits = any(conditional_targets.get(source, set()) - members for source in members)
+        if not exits:
+            report.errors.append(
+                f"Cycle {' -> '.join(component + component[:1])} has no conditional exit and will "
+                f"run until the recursion limit"
+            )
+
+    try:
+        graph.compile()
+    except Exception as e:
+        report.errors.append(f"Graph failed to compile: {type(e).__name__}: {e}")
+
+    return report
+
+
+def _is_send_target(func: Callable, value: str) -> bool:
+    """Returns True if the routing function dispatches to ``value`` with Send()."""
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(func)))
+    except (OSError, TypeError, SyntaxError):
+        return False
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and getattr(node.func, "id", getattr(node.func, "attr", None)) == "Send":
+            if node.args and _string_targets(node.args[0]) == [value]:
+                return True
+    return False
+
+
+def validate_package(package_dir: str, factory: Optional[str] = None) -> GraphValidationReport:
+    """Imports the graph factory of a generated package and validates its topology.
+
+    Args:
+        package_dir: Root directory of the generated package
+        factory: Optional ``module:function`` reference of the graph factory
+
+    Returns:
+        A report listing every problem found
+    """
+    report = GraphValidationReport(package_dir=package_dir)
+    with package_on_path(package_dir):
+        try:
+            graph_factory, report.factory = load_graph_factory(package_dir, factory)
+            graph = build_graph(graph_factory)
+        except Exception as e:
+            report.errors.append(f"Could not build the graph: {type(e).__name__}: {e}")
+            return report
+        return validate_graph(graph, report)
+
+
+class GraphValidatorInput(BaseModel):
+    """Input schema for GraphValidatorTool."""
+
+    package_dir: str = Field(
+        ...,
+        description="Root directory of the generated LangGraph package (the directory containing main.py).",
+    )
+    factory: Optional[str] = Field(
+        None,
+        description="Graph factory as 'module:function' (e.g. 'src.graph:create_graph'). Discovered automatically if omitted.",
+    )
+
+
+class GraphValidatorTool(BaseTool):
+    name: str = "graph_validator"
+    description: str = (
+        "Statically validates the LangGraph graph of a generated package without running it. "
+        "Imports the graph factory and reports conditional-edge return values missing from their "
+        "path maps, edges to nodes that were never added, unreachable nodes, cycles without an exit "
+        "and compile errors. Run it before executing generated code and fix every reported error."
+    )
+    args_schema: Type[BaseModel] = GraphValidatorInput
+
+    def _run(self, package_dir: str, factory: Optional[str] = None) -> str:
+        """Validate the graph of a generated package.
+
+        Args:
+            package_dir: Root directory of the generated package
+            factory: Optional 'module:function' reference of the graph factory
+
+        Returns:
+            The validation report as text
+        """
+        try:
+            return validate_package(package_dir, factory).format()
+        except Exception as e:
+            return f"Error during graph validation: {str(e)}"
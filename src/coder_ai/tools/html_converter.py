@@ -0,0 +1,115 @@
+"""HTML to markdown conversion with docling, run in a pool of worker processes.
+
+Converting pages inside the crawler's event loop competes with network I/O for a
+single core. These functions run in separate processes instead, so conversion scales
+with the number of cores while the crawler keeps fetching. docling keeps tables as
+markdown tables and code blocks as fenced code.
+
+docling's markdown export reduces every picture to a bare ``<!-- image -->`` placeholder,
+so the image references the crawler collected are appended to the converted page with
+``image_references()``.
+"""
+import importlib.util
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+# DocumentConverter of the current worker process, created once by init_worker()
+_converter = None
+
+
+def available_cores() -> int:
+    """Number of cores this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def docling_available() -> bool:
+    """Whether docling can be imported, checked without importing it."""
+    return importlib.util.find_spec("docling") is not None
+
+
+def init_worker() -> None:
+    """Process pool initializer: loads docling once per worker instead of once per page."""
+    global _converter
+    from docling.document_converter import DocumentConverter
+
+    _converter = DocumentConverter()
+
+
+def fit_markdown(markdown: str) -> str:
+    """Trims docling output for LLM consumption without touching tables or code blocks."""
+    markdown = re.sub(r"^\s*<!-- image -->\s*$", "", markdown, flags=re.MULTILINE)
+    return re.sub(r"\n{3,}", "\n\n", markdown).strip() + "\n"
+
+
+def html_to_markdown(html: str, fit_for_llm: bool = True) -> str:
+    """Converts one HTML page to markdown. Runs inside a worker process.
+
+    Args:
+        html: Raw HTML of the page
+        fit_for_llm: Trim image placeholders and redundant blank lines
+
+    Returns:
+        The page as markdown
+    """
+    from docling.datamodel.base_models import DocumentStream
+
+    if _converter is None:
+        init_worker()
+    stream = DocumentStream(name="page.html", stream=BytesIO(html.encode("utf-8")))
+    markdown = _converter.convert(stream).document.export_to_markdown()
+    return fit_markdown(markdown) if fit_for_llm else markdown
+
+
+def image_references(images: List[Dict], page_url: str) -> str:
+    """Markdown section listing the images of a page, from the crawler's ``result.media["images"]``.
+
+    Args:
+        images: Image entries with ``src`` and optionally ``alt`` and ``desc``
+        page_url: URL of the page, to resolve relative image sources
+
+    Returns:
+        An "Images" section with one markdown image per distinct source, or "" if there are none
+    """
+    lines = []
+    seen = set()
+    for image in images or []:
+        src = (image.get("src") or "").strip()
+        if not src or src.startswith("data:"):
+            continue
+        src = urljoin(page_url, src)
+        if src in seen:
+            continue
+        seen.add(src)
+        alt = re.sub(r"\s+", " ", image.get("alt") or "").strip()
+        desc = re.sub(r"\s+", " ", image.get("desc") or "").strip()
+        lines.append(f"- ![{alt}]({src})" + (f" - {desc}" if desc and desc != alt else ""))
+    if not lines:
+        return ""
+    return "\n\n## Images\n\n" + "\n".join(lines) + "\n"
+
+
+def create_conversion_pool(max_workers: Optional[int] = None, max_pages: Optional[int] = None) -> ProcessPoolExecutor:
+    """Creates the process pool used for conversion.
+
+    Workers are spawned rather than forked: the pool is started from inside a crew
+    kickoff, where telemetry and memory compaction threads are already running, and
+    forking a multi-threaded process can deadlock the children.
+
+    Args:
+        max_workers: Number of worker processes; defaults to the available cores
+        max_pages: Number of pages to convert, if known; no more workers are started,
+            since each one loads docling
+    """
+    workers = max_workers or available_cores()
+    if max_pages:
+        workers = min(workers, max_pages)
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                               initializer=init_worker)
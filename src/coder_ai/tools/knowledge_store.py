@@ -0,0 +1,343 @@
+import contextlib
+import hashlib
+import json
+import mmap
+import os
+import re
+import threading
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+PACK_FILENAME = "knowledge.pack"
+INDEX_FILENAME = "knowledge.idx"
+
+# Chunks are split at markdown headings and kept below this many characters
+MAX_CHUNK_CHARS = 4000
+
+
+def split_chunks(markdown: str, max_chars: int = MAX_CHUNK_CHARS) -> List[str]:
+    """Splits markdown at headings into chunks of at most ``max_chars`` characters.
+
+    Fenced code blocks are never split at a heading-like line inside them.
+    """
+    sections: List[str] = []
+    current: List[str] = []
+    in_code = False
+    for line in markdown.splitlines(keepends=True):
+        if line.lstrip().startswith("```"):
+            in_code = not in_code
+        if not in_code and re.match(r"#{1,6} ", line) and current:
+            sections.append("".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("".join(current))
+
+    chunks: List[str] = []
+    for section in sections:
+        if chunks and len(chunks[-1]) + len(section) <= max_chars:
+            chunks[-1] += section
+            continue
+        while len(section) > max_chars:
+            # Prefer a line break in the second half of the window, otherwise cut hard
+            cut = section.rfind("\n", max_chars // 2, max_chars) + 1 or max_chars
+            chunks.append(section[:cut])
+            section = section[cut:]
+        if section:
+            chunks.append(section)
+    return chunks or [""]
+
+
+class KnowledgeStore:
+    """Append-only, compressed single-file store for crawled documentation.
+
+    Every chunk is a zlib-compressed record in ``knowledge.pack``; ``knowledge.idx`` holds
+    one JSON line per chunk with its offset and length. Reads slice a memory map of the
+    pack, so random access by URL or chunk id costs no extra open/read syscalls.
+
+    Appending a URL that is already stored supersedes its previous document, which is
+    skipped by every read from then on; unchanged documents are not appended again.
+    ``compact()`` drops superseded documents from the files.
+
+    Compaction writes the surviving chunks to a new pack generation (``knowledge.N.pack``)
+    and a new index whose first line names that pack, then switches to both with a single
+    rename of the index. The index therefore always points at the pack its offsets belong to.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.pack_path = os.path.join(directory, PACK_FILENAME)
+        self.index_path = os.path.join(directory, INDEX_FILENAME)
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._chunks: Dict[str, Dict] = {}  # chunk id -> index record
+        self._documents: Dict[str, List[str]] = {}  # doc id -> chunk ids in order
+        self._urls: Dict[str, str] = {}  # url -> latest doc id
+        self._next_doc = 1
+        self._file = None
+        self._map: Optional[mmap.mmap] = None
+        self._load_index()
+
+    @staticmethod
+    def exists(directory: str) -> bool:
+        return os.path.exists(os.path.join(directory, INDEX_FILENAME))
+
+    def _load_index(self) -> None:
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn last line from an interrupted append; its record is ignored
+                    continue
+                if "pack" in record:
+                    # Header of a compacted index: the pack generation its offsets refer to
+                    self._generation = record["generation"]
+                    self.pack_path = os.path.join(self.directory, record["pack"])
+                else:
+                    self._register(record)
+
+    def _register(self, record: Dict) -> None:
+        self._chunks[record["id"]] = record
+        chunk_ids = self._documents.setdefault(record["doc"], [])
+        if record["id"] not in chunk_ids:
+            chunk_ids.append(record["id"])
+        self._urls[record["url"]] = record["doc"]
+        self._next_doc = max(self._next_doc, int(record["doc"].split("_")[-1]) + 1)
+
+    def _live(self, doc_id: str) -> bool:
+        """Whether a document is the latest one of its URL."""
+        return self._urls.get(self._chunks[self._documents[doc_id][0]]["url"]) == doc_id
+
+    def append(self, url: str, markdown: str, title: str = "", metadata: Optional[Dict] = None) -> str:
+        """Appends a document, split into chunks, and returns its doc id.
+
+        If the URL is already stored with the same content, nothing is written and the
+        existing doc id is returned; otherwise the new document supersedes the old one.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        digest = hashlib.sha256(markdown.encode("utf-8")).hexdigest()
+        with self._lock:
+            previous = self._urls.get(url)
+            if previous and self._chunks[self._documents[previous][0]].get("sha256") == digest:
+                return previous
+            doc_id = f"doc_{self._next_doc}"
+            records = []
+            with open(self.pack_path, "ab") as pack:
+                for number, chunk in enumerate(split_chunks(markdown)):
+                    data = zlib.compress(chunk.encode("utf-8"), 6)
+                    records.append({
+                        "id": f"{doc_id}#{number}",
+                        "doc": doc_id,
+                        "url": url,
+                        "title": title,
+                        "chunk": number,
+                        "offset": pack.tell(),
+                        "length": len(data),
+                        "size": len(chunk),
+                        "sha256": digest,
+                        "metadata": metadata or {},
+                    })
+                    pack.write(data)
+                pack.flush()
+                os.fsync(pack.fileno())
+            # The index is written after the data it points to, so readers never see dangling offsets
+            with open(self.index_path, "a", encoding="utf-8") as index:
+                index.writelines(json.dumps(record) + "\n" for record in records)
+            for record in records:
+                self._register(record)
+        return doc_id
+
+    def _read(self, record: Dict) -> str:
+        end = record["offset"] + record["length"]
+        with self._lock:
+            if self._map is None or end > len(self._map):
+                # The pack grew since it was mapped
+                self._close_map()
+                self._file = open(self.pack_path, "rb")
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            data = self._map[record["offset"]:end]
+        return zlib.decompress(data).decode("utf-8")
+
+    def _close_map(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_map()
+
+    def __enter__(self) -> "KnowledgeStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def get_chunk(self, chunk_id: str) -> str:
+        """Returns one chunk by id, e.g. ``doc_3#0``."""
+        if chunk_id not in self._chunks:
+            raise KeyError(f"Unknown chunk id '{chunk_id}'")
+        return self._read(self._chunks[chunk_id])
+
+    def get_document(self, key: str) -> str:
+        """Returns a whole document by URL or doc id; superseded doc ids still resolve until compaction."""
+        doc_id = self._urls.get(key, key)
+        if doc_id not in self._documents:
+            raise KeyError(f"Unknown document '{key}'")
+        return "".join(self.get_chunk(chunk_id) for chunk_id in self._documents[doc_id])
+
+    def documents(self) -> List[Dict]:
+        """Lists the current documents: doc id, URL, title and chunk ids."""
+        listing = []
+        for doc_id, chunk_ids in self._documents.items():
+            if not self._live(doc_id):
+                continue
+            first = self._chunks[chunk_ids[0]]
+            listing.append({"doc": doc_id, "url": first["url"], "title": first["title"], "chunks": chunk_ids})
+        return listing
+
+    def iter_documents(self) -> Iterator[Tuple[str, str, str]]:
+        """Yields (doc id, URL, markdown) for every document."""
+        for document in self.documents():
+            yield document["doc"], document["url"], self.get_document(document["doc"])
+
+    def export_markdown(self, output_dir: str) -> List[str]:
+        """Writes every document back out as ``doc_N.md`` and returns the file paths."""
+        os.makedirs(output_dir, exist_ok=True)
+        paths = []
+        for doc_id, _, markdown in self.iter_documents():
+            path = os.path.join(output_dir, f"{doc_id}.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(markdown)
+            paths.append(path)
+        return paths
+
+
+    def superseded(self) -> int:
+        """Number of stored documents replaced by a newer version of their URL."""
+        return sum(1 for doc_id in self._documents if not self._live(doc_id))
+
+    def compact(self) -> int:
+        """Rewrites the pack and index without superseded documents.
+
+        The new files replace the old ones with renames; readers in other processes must
+        reopen the store afterwards.
+
+        Returns:
+            Number of bytes reclaimed
+        """
+        with self._lock:
+            if not any(not self._live(doc_id) for doc_id in self._documents):
+                return 0
+            before = os.path.getsize(self.pack_path)
+            records = []
+            generation = self._generation + 1
+            pack_name = f"knowledge.{generation}.pack"
+            new_pack_path = os.path.join(self.directory, pack_name)
+            index_tmp = f"{self.index_path}.tmp"
+            with open(self.pack_path, "rb") as source, open(new_pack_path, "wb") as pack:
+                for doc_id, chunk_ids in self._documents.items():
+                    if not self._live(doc_id):
+                        continue
+                    for chunk_id in chunk_ids:
+                        record = dict(self._chunks[chunk_id])
+                        source.seek(record["offset"])
+                        data = source.read(record["length"])
+                        record["offset"] = pack.tell()
+                        pack.write(data)
+                        records.append(record)
+                pack.flush()
+                os.fsync(pack.fileno())
+            with open(index_tmp, "w", encoding="utf-8") as index:
+                index.write(json.dumps({"pack": pack_name, "generation": generation}) + "\n")
+                index.writelines(json.dumps(record) + "\n" for record in records)
+                index.flush()
+                os.fsync(index.fileno())
+            # The only switch: until this rename the old index and old pack stay in use
+            os.replace(index_tmp, self.index_path)
+            self._fsync_directory()
+            self._close_map()
+            old_pack_path = self.pack_path
+            self.pack_path, self._generation = new_pack_path, generation
+            with contextlib.suppress(OSError):
+                # Already switched; a leftover pack is only wasted space
+                os.remove(old_pack_path)
+            self._chunks, self._documents, self._urls = {}, {}, {}
+            for record in records:
+                self._register(record)
+            return before - os.path.getsize(self.pack_path)
+
+    def _fsync_directory(self) -> None:
+        """Makes a rename inside the store directory durable, where the platform supports it."""
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+class KnowledgeStoreReadInput(BaseModel):
+    """Input schema for KnowledgeStoreReadTool."""
+
+    store_dir: str = Field(
+        ...,
+        description="Directory containing the knowledge store (knowledge.idx and its pack).",
+    )
+    key: Optional[str] = Field(
+        None,
+        description=(
+            "What to read: a source URL or doc id (e.g. 'doc_3') for a whole document, or a chunk id "
+            "(e.g. 'doc_3#1') for one section. Leave empty to list the stored documents."
+        ),
+    )
+
+
+class KnowledgeStoreReadTool(BaseTool):
+    name: str = "knowledge_store_reader"
+    description: str = (
+        "Reads processed documentation from a compact knowledge store. Lists the stored documents "
+        "with their URLs and chunk ids, or returns one document by URL/doc id or one section by chunk id."
+    )
+    args_schema: Type[BaseModel] = KnowledgeStoreReadInput
+
+    def _run(self, store_dir: str, key: Optional[str] = None) -> str:
+        """Read from a knowledge store.
+
+        Args:
+            store_dir: Directory containing the store
+            key: URL, doc id or chunk id; lists the documents when empty
+
+        Returns:
+            The requested content or the document listing
+        """
+        try:
+            if not KnowledgeStore.exists(store_dir):
+                return f"Error: no knowledge store found in '{store_dir}'."
+            with KnowledgeStore(store_dir) as store:
+                if not key:
+                    return "\n".join(
+                        f"{document['doc']} ({len(document['chunks'])} chunks): {document['title']} - {document['url']}"
+                        for document in store.documents()
+                    )
+                # URLs may carry #fragments; chunk ids never start with a scheme
+                if "#" in key and not key.startswith(("http://", "https://")):
+                    return store.get_chunk(key)
+                return store.get_document(key)
+        except KeyError as e:
+            return f"Error: {e.args[0]}"
+        except Exception as e:
+            return f"Error reading knowledge store: {str(e)}"
@@ -0,0 +1,204 @@
+import ast
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Dict, List, Optional, Type
+
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+
+
+def _safe_relative_path(path: str) -> str:
+    """Normalizes a package-relative path and rejects paths escaping the package."""
+    normalized = os.path.normpath(path.replace("\\", "/"))
+    if not path.strip() or os.path.isabs(normalized) or normalized == "." or normalized.split(os.sep)[0] == "..":
+        raise ValueError(f"Invalid file path '{path}': paths must be relative to the package directory")
+    return normalized
+
+
+def _check_output_dir(output_dir: str, root_dir: Optional[str], base_dir: Optional[str], allow_in_place: bool) -> None:
+    """Rejects output directories whose replacement could destroy more than one package."""
+    resolved = os.path.realpath(output_dir)
+    if root_dir is not None:
+        root = os.path.realpath(root_dir)
+        if os.path.dirname(resolved) != root or os.path.basename(resolved).startswith("."):
+            raise ValueError(
+                f"Output directory '{output_dir}' must be a package directory directly inside '{root_dir}'"
+            )
+    if base_dir and not allow_in_place and resolved == os.path.realpath(base_dir):
+        raise ValueError(
+            f"Output directory '{output_dir}' is the base directory; use keep_existing to update a package in place"
+        )
+
+
+def write_package(
+    output_dir: str,
+    files: Dict[str, str],
+    keep_existing: bool = False,
+    base_dir: Optional[str] = None,
+    root_dir: Optional[str] = None,
+    allow_in_place: bool = False,
+) -> List[Dict[str, object]]:
+    """Writes a whole file tree into ``output_dir`` atomically.
+
+    The tree is staged in a temporary sibling directory and only then swapped in with two
+    renames, so a failure part-way through leaves the previous package untouched and the
+    new package never appears half-written. Between the two renames ``output_dir`` briefly
+    does not exist.
+
+    Args:
+        output_dir: Package directory to create or replace
+        files: Mapping of package-relative file path to file content
+        keep_existing: Carry over existing files that are not part of ``files``
+        base_dir: Package to start from, e.g. a scaffold; its files are copied first
+        root_dir: If given, ``output_dir`` must be a direct, non-hidden subdirectory of it
+        allow_in_place: Allow ``output_dir`` to be ``base_dir``
+
+    Returns:
+        One entry per written file with its path, size in bytes, sha256 and any syntax error
+    """
+    if not files and not base_dir:
+        raise ValueError("No files given")
+    if base_dir and not os.path.isdir(base_dir):
+        raise ValueError(f"Base directory '{base_dir}' does not exist")
+    _check_output_dir(output_dir, root_dir, base_dir, allow_in_place)
+    output_dir = os.path.realpath(output_dir)
+    parent = os.path.dirname(output_dir)
+    os.makedirs(parent, exist_ok=True)
+    tree = {_safe_relative_path(path): content for path, content in files.items()}
+
+    # Staging next to the target keeps the final rename on the same filesystem
+    staging = tempfile.mkdtemp(prefix=f".{os.path.basename(output_dir)}.", suffix=".tmp", dir=parent)
+    # mkdtemp creates the directory private to the user; the package should not be
+    os.chmod(staging, 0o755)
+    backup = None
+    try:
+        if base_dir:
+            shutil.copytree(base_dir, staging, dirs_exist_ok=True, ignore=shutil.ignore_patterns("__pycache__", ".*"))
+        if keep_existing and os.path.isdir(output_dir):
+            shutil.copytree(output_dir, staging, dirs_exist_ok=True)
+
+        written = []
+        for path, content in sorted(tree.items()):
+            data = content.encode("utf-8")
+            target = os.path.join(staging, path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+
+            entry = {"path": path, "size": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+            if path.endswith(".py"):
+                try:
+                    ast.parse(content, filename=path)
+                except SyntaxError as e:
+                    entry["syntax_error"] = f"line {e.lineno}: {e.msg}"
+            written.append(entry)
+
+        if os.path.exists(output_dir):
+            backup = f"{staging}.old"
+            os.rename(output_dir, backup)
+        try:
+            os.rename(staging, output_dir)
+        except OSError:
+            if backup:
+                os.rename(backup, output_dir)
+                backup = None
+            raise
+        return written
+    finally:
+        if os.path.exists(staging):
+            shutil.rmtree(staging, ignore_errors=True)
+        if backup:
+            shutil.rmtree(backup, ignore_errors=True)
+
+
+def read_package(package_dir: str) -> Dict[str, str]:
+    """Reads the text files of a package as a mapping of relative path to content."""
+    files = {}
+    for root, dirs, names in os.walk(package_dir):
+        dirs[:] = [d for d in dirs if d != "__pycache__" and not d.startswith(".")]
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                with open(path, "r", encoding="utf-8", newline="") as f:
+                    files[os.path.relpath(path, package_dir)] = f.read()
+            except UnicodeDecodeError:
+                continue
+    return files
+
+
+class PackageWriterInput(BaseModel):
+    """Input schema for PackageWriterTool."""
+
+    output_dir: str = Field(
+        ...,
+        description="Package directory to write, e.g. the agent code directory.",
+    )
+    files: Dict[str, str] = Field(
+        ...,
+        description=(
+            "Every file of the package as a mapping of relative path to full file content, "
+            "e.g. {'main.py': '...', 'src/graph.py': '...', 'README.md': '...'}."
+        ),
+    )
+    keep_existing: bool = Field(
+        False,
+        description="Keep files already in the directory that are not listed in 'files'. By default the directory is replaced.",
+    )
+    base_dir: Optional[str] = Field(
+        None,
+        description="Existing package (e.g. a scaffold) to start from. Its files are copied first, then 'files' overwrite or add to them.",
+    )
+
+
+class PackageWriterTool(BaseTool):
+    name: str = "package_writer"
+    description: str = (
+        "Writes a complete multi-file package in a single call. Takes every file of the package "
+        "(code, README.md, requirements.txt) as a mapping of relative path to content and writes "
+        "them atomically: either the whole package is written or nothing changes. Returns the "
+        "size and sha256 of each file and reports Python syntax errors. With base_dir, an existing "
+        "package is used as the starting point and only changed files need to be given."
+    )
+    args_schema: Type[BaseModel] = PackageWriterInput
+
+    root_dir: Optional[str] = Field(
+        None,
+        description="Directory the tool may write packages into; output_dir must be a direct subdirectory of it.",
+    )
+    allow_in_place: bool = Field(False, description="Allow output_dir to be the same directory as base_dir.")
+
+    def _run(
+        self,
+        output_dir: str,
+        files: Dict[str, str],
+        keep_existing: bool = False,
+        base_dir: Optional[str] = None,
+    ) -> str:
+        """Write a package atomically.
+
+        Args:
+            output_dir: Package directory to create or replace
+            files: Mapping of relative file path to file content
+            keep_existing: Carry over existing files not listed in files
+            base_dir: Existing package to start from
+
+        Returns:
+            A JSON summary of the written files
+        """
+        try:
+            written = write_package(output_dir, files, keep_existing, base_dir,
+                                    root_dir=self.root_dir, allow_in_place=self.allow_in_place)
+            summary = {
+                "output_dir": os.path.abspath(output_dir),
+                "files": written,
+                "total_bytes": sum(entry["size"] for entry in written),
+                "syntax_errors": sum(1 for entry in written if "syntax_error" in entry),
+            }
+            return json.dumps(summary, indent=2)
+        except Exception as e:
+            return f"Error writing package: {str(e)}"
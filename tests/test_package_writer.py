@@ -0,0 +1,93 @@
+import os
+
+import pytest
+
+from coder_ai.tools import package_writer_tool
+from coder_ai.tools.package_writer_tool import PackageWriterTool, _safe_relative_path, read_package, write_package
+
+FILES = {"main.py": "print('new')\n", "src/graph.py": "GRAPH = 'new'\n"}
+
+
+@pytest.fixture
+def root(tmp_path):
+    """A generated_code-like root holding two existing packages."""
+    for name in ("agent", "other_agent"):
+        package = tmp_path / name
+        (package / "src").mkdir(parents=True)
+        (package / "main.py").write_text("print('old')\n")
+        (package / "src" / "graph.py").write_text("GRAPH = 'old'\n")
+    return tmp_path
+
+
+def test_writes_package_inside_root(root):
+    write_package(str(root / "agent"), FILES, root_dir=str(root))
+    assert read_package(str(root / "agent")) == {os.path.join(*path.split("/")): content for path, content in FILES.items()}
+    assert read_package(str(root / "other_agent"))["main.py"] == "print('old')\n"
+
+
+@pytest.mark.parametrize("output_dir", [".", "agent/..", "agent/src", ".candidates", "../outside"])
+def test_rejects_output_dir_that_is_not_a_package_directly_inside_root(root, output_dir):
+    with pytest.raises(ValueError, match="must be a package directory directly inside"):
+        write_package(str(root / output_dir), FILES, root_dir=str(root))
+    assert sorted(os.listdir(root)) == ["agent", "other_agent"]
+    assert read_package(str(root / "other_agent"))["main.py"] == "print('old')\n"
+
+
+@pytest.mark.parametrize("path", ["../escape.py", "src/../../escape.py", "/tmp/escape.py", "", "."])
+def test_rejects_file_paths_escaping_the_package(path):
+    with pytest.raises(ValueError, match="Invalid file path"):
+        _safe_relative_path(path)
+
+
+def test_keeps_file_paths_inside_the_package():
+    assert _safe_relative_path("src/./nodes/../graph.py") == os.path.join("src", "graph.py")
+
+
+def test_rejects_escaping_file_path_without_touching_the_package(root):
+    with pytest.raises(ValueError, match="Invalid file path"):
+        write_package(str(root / "agent"), {"main.py": "", "../other_agent/main.py": ""}, root_dir=str(root))
+    assert read_package(str(root / "agent"))["main.py"] == "print('old')\n"
+    assert read_package(str(root / "other_agent"))["main.py"] == "print('old')\n"
+
+
+def test_rejects_base_dir_equal_to_output_dir(root):
+    with pytest.raises(ValueError, match="is the base directory"):
+        write_package(str(root / "agent"), {"main.py": "print('new')\n"}, base_dir=str(root / "agent"), root_dir=str(root))
+    assert read_package(str(root / "agent"))["main.py"] == "print('old')\n"
+
+
+def test_allow_in_place_updates_the_base_dir(root):
+    write_package(str(root / "agent"), {"main.py": "print('new')\n"}, base_dir=str(root / "agent"),
+                  root_dir=str(root), allow_in_place=True)
+    assert read_package(str(root / "agent")) == {"main.py": "print('new')\n", os.path.join("src", "graph.py"): "GRAPH = 'old'\n"}
+
+
+def test_failed_write_leaves_previous_package_intact(root):
+    # "main.py" is written as a file first, so "main.py/nested.py" cannot be created
+    with pytest.raises(OSError):
+        write_package(str(root / "agent"), {"main.py": "", "main.py/nested.py": ""}, root_dir=str(root))
+    assert read_package(str(root / "agent"))["main.py"] == "print('old')\n"
+    assert sorted(os.listdir(root)) == ["agent", "other_agent"]
+
+
+def test_failed_swap_restores_previous_package(root, monkeypatch):
+    rename = os.rename
+
+    def fail_on_swap(source, target):
+        # Only the staged package moving into place fails; restoring the backup still works
+        if source.endswith(".tmp"):
+            raise OSError("rename failed")
+        rename(source, target)
+
+    monkeypatch.setattr(package_writer_tool.os, "rename", fail_on_swap)
+    with pytest.raises(OSError, match="rename failed"):
+        write_package(str(root / "agent"), FILES, root_dir=str(root))
+    monkeypatch.undo()
+    assert read_package(str(root / "agent"))["main.py"] == "print('old')\n"
+    assert sorted(os.listdir(root)) == ["agent", "other_agent"]
+
+
+def test_tool_reports_rejected_root_as_error(root):
+    result = PackageWriterTool(root_dir=str(root))._run(output_dir=str(root), files=FILES)
+    assert result.startswith("Error writing package:")
+    assert sorted(os.listdir(root)) == ["agent", "other_agent"]